@@ -0,0 +1,262 @@
+"""Benchmarks dos caminhos críticos da calculadora PRICE.
+
+Mede tempo por chamada (mínimo e mediana de várias repetições) e pico de
+memória (tracemalloc) de:
+
+- `tabela_price` com n = 12, 60 e 360;
+- inversão da taxa como em `render_taxa` (`npf.rate` de referência e `taxa_price`);
+- cotações avulsas em Python puro (`financeiro.indice_anuidade`);
+- tabelas em centavos inteiros (`financeiro.centavos`);
+- simulação de pré-pagamento e inadimplência (`financeiro.simulacao`, um lote);
+- parsers de número de `helpers` / `financeiro.numeros`;
+- formatação da tabela para exibição e geração do CSV feitas pelas abas.
+
+Uso (a partir da raiz do repositório):
+
+    python -m benchmarks.bench_price                      # só mostra os tempos
+    python -m benchmarks.bench_price --salvar main        # grava baselines/main.json
+    python -m benchmarks.bench_price --comparar main      # compara com a baseline
+    python -m benchmarks.bench_price --filtro tabela      # só casos com 'tabela' no nome
+
+Com `--comparar`, o código de saída é 1 se algum caso ficar mais lento que
+`--limite` vezes a baseline.
+"""
+import argparse
+import functools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from financeiro import (
+    formatar_brl_array,
+    parcela_price,
+    parse_brl_array,
+    parse_number,
+    parse_number_string,
+    tabela_centavos_lote,
+    tabela_price,
+    taxa_price,
+    taxa_price_lote,
+)
+
+from financeiro.indice_anuidade import obter_indice, parcela_rapida, taxa_rapida
+from financeiro.simulacao import simular_emprestimo
+
+PASTA_BASELINES = Path(__file__).resolve().parent / "baselines"
+
+
+def _direto(funcao):
+    """Caso sem preparação."""
+    return lambda: funcao
+
+
+@functools.lru_cache(maxsize=None)
+def _lote():
+    """10 mil empréstimos aleatórios (prazo, PV, parcela), gerados só se algum caso os usar."""
+    rng = np.random.default_rng(0)
+    n_lote = rng.integers(1, 361, 10_000)
+    pv_lote = rng.uniform(100.0, 100_000.0, 10_000)
+    pmt_lote = pv_lote / n_lote * rng.uniform(1.0, 2.0, 10_000)
+    return n_lote, pv_lote, pmt_lote
+
+
+@functools.lru_cache(maxsize=None)
+def _textos():
+    return list(formatar_brl_array(np.random.default_rng(0).uniform(0, 1e6, 10_000)))
+
+
+@functools.lru_cache(maxsize=None)
+def _tabela_360():
+    return tabela_price(0.02, 360, 100_000.0)
+
+
+def _taxa_price_lote():
+    n_lote, pv_lote, pmt_lote = _lote()
+    return lambda: taxa_price_lote(n_lote, pmt_lote, pv_lote)
+
+
+def _centavos_lote():
+    n_lote, pv_lote, _ = _lote()
+    npers, pvs = n_lote[:1000], np.round(pv_lote[:1000] * 100)
+    return lambda: tabela_centavos_lote(0.02, npers, pvs)
+
+
+def _taxa_rapida():
+    obter_indice()  # a tabela é construída uma vez por processo, fora da medição
+    return lambda: taxa_rapida(5, 566.936054, 2519.0)
+
+
+def _parse(funcao):
+    def preparar():
+        textos = _textos()
+        return lambda: [funcao(t) for t in textos]
+    return preparar
+
+
+def _parse_array():
+    textos = _textos()
+    return lambda: parse_brl_array(textos)
+
+
+def _exibicao_apply():
+    df = _tabela_360()
+    colunas = ["Parcela", "Juros", "Amortização", "Saldo Devedor"]
+
+    def formatar_apply():
+        df_display = df.copy()
+        for c in colunas:
+            df_display[c] = df_display[c].apply(lambda x: f"R$ {x:,.2f}")
+        return df_display
+    return formatar_apply
+
+
+def _exibicao_vetorizada():
+    df = _tabela_360()
+    colunas = ["Parcela", "Juros", "Amortização", "Saldo Devedor"]
+
+    def formatar_vetorizado():
+        df_display = df.copy()
+        for c in colunas:
+            df_display[c] = formatar_brl_array(df[c].to_numpy())
+        return df_display
+    return formatar_vetorizado
+
+
+def _csv():
+    df = _tabela_360()
+    return lambda: df.to_csv(index=False).encode("utf-8")
+
+
+def _casos():
+    """Lista de (nome, preparar): `preparar()` monta os dados do caso e devolve a função sem argumentos a medir.
+
+    A preparação só roda para os casos selecionados (ex: com `--filtro`).
+    """
+    import numpy_financial as npf
+
+    casos = []
+    for n in (12, 60, 360):
+        casos.append((f"tabela_price[n={n}]", _direto(lambda n=n: tabela_price(0.02, n, 100_000.0))))
+
+    pv, parcela = 2519.0, 566.936054
+    casos.append(("taxa[npf.rate]", _direto(lambda: npf.rate(5, -parcela, pv, fv=0))))
+    casos.append(("taxa[taxa_price]", _direto(lambda: taxa_price(5, parcela, pv))))
+    casos.append(("taxa[taxa_price_lote x10k]", _taxa_price_lote))
+    casos.append(("centavos[tabela_centavos_lote x1k]", _centavos_lote))
+    casos.append(("simulacao[simular_emprestimo n=48 x10k]", _direto(lambda: simular_emprestimo(0.02, 48, 25_000.0, 0.0135, 0.0043, 0.4, caminhos=10_000))))
+
+    casos.append(("taxa[taxa_rapida]", _taxa_rapida))
+    casos.append(("parcela[parcela_price]", _direto(lambda: parcela_price(0.02, 36, 10_000.0))))
+    casos.append(("parcela[parcela_rapida]", _direto(lambda: parcela_rapida(0.02, 36, 10_000.0))))
+
+    casos.append(("parse[parse_number_string x10k]", _parse(parse_number_string)))
+    casos.append(("parse[parse_number x10k]", _parse(parse_number)))
+    casos.append(("parse[parse_brl_array x10k]", _parse_array))
+
+    casos.append(("exibicao[apply n=360]", _exibicao_apply))
+    casos.append(("exibicao[formatar_brl_array n=360]", _exibicao_vetorizada))
+    casos.append(("csv[to_csv n=360]", _csv))
+    return casos
+
+
+def medir(funcao, repeticoes=7, tempo_minimo=0.05):
+    """Tempo por chamada (min/mediana, em segundos) e pico de memória (bytes)."""
+    funcao()  # aquecimento (imports, caches internos)
+    # calibrar quantas chamadas cabem em `tempo_minimo`
+    chamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        if time.perf_counter() - inicio >= tempo_minimo or chamadas >= 1_000_000:
+            break
+        chamadas *= 2
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        tempos.append((time.perf_counter() - inicio) / chamadas)
+
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"min": min(tempos), "mediana": statistics.median(tempos), "pico_memoria": pico, "chamadas": chamadas}
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _formatar_tempo(segundos):
+    for unidade, fator in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if segundos >= fator:
+            return f"{segundos / fator:8.2f} {unidade}"
+    return f"{segundos / 1e-9:8.2f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos da calculadora PRICE.")
+    parser.add_argument("--salvar", metavar="NOME", help="grava os resultados em benchmarks/baselines/NOME.json")
+    parser.add_argument("--comparar", metavar="NOME", help="compara com benchmarks/baselines/NOME.json")
+    parser.add_argument("--limite", type=float, default=1.25, help="razão máxima aceita na comparação (padrão: 1.25)")
+    parser.add_argument("--filtro", default="", help="só executa casos cujo nome contém este texto")
+    parser.add_argument("--repeticoes", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.comparar:
+        baseline = json.loads((PASTA_BASELINES / f"{args.comparar}.json").read_text(encoding="utf-8"))["resultados"]
+
+    resultados = {}
+    regressoes = []
+    print(f"{'caso':40s} {'mínimo':>11s} {'mediana':>11s} {'pico mem.':>11s}" + ("   vs baseline" if baseline else ""))
+    for nome, preparar in _casos():
+        if args.filtro not in nome:
+            continue
+        r = medir(preparar(), repeticoes=args.repeticoes)
+        resultados[nome] = r
+        linha = f"{nome:40s} {_formatar_tempo(r['min'])} {_formatar_tempo(r['mediana'])} {r['pico_memoria'] / 1024:8.1f} KiB"
+        if baseline and nome in baseline:
+            razao = r["min"] / baseline[nome]["min"]
+            linha += f"   {razao:5.2f}x"
+            if razao > args.limite:
+                linha += "  <-- regressão"
+                regressoes.append(nome)
+        print(linha)
+
+    if args.salvar:
+        PASTA_BASELINES.mkdir(exist_ok=True)
+        destino = PASTA_BASELINES / f"{args.salvar}.json"
+        destino.write_text(json.dumps({
+            "commit": _commit_atual(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "maquina": platform.platform(),
+            "resultados": resultados,
+        }, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nBaseline gravada em {destino}")
+
+    if regressoes:
+        print(f"\n{len(regressoes)} caso(s) acima de {args.limite:.2f}x a baseline: {', '.join(regressoes)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,467 @@
+"""Teste de carga local do `streamlit_app.py` com várias sessões simultâneas.
+
+Sobe o app num servidor Streamlit local (headless, porta livre) e abre N
+sessões pelo mesmo websocket que o navegador usa. As sessões alternam entre
+"Calcular Parcela", "Calcular Taxa" e "Calcular Valor Presente" e editam os
+campos de cada calculadora; cada edição é uma reexecução do script no
+servidor, cronometrada do envio até o fim da execução (`script_finished`).
+Os widgets são localizados e preenchidos com a árvore de elementos do
+`streamlit.testing` (a mesma do AppTest), montada a partir das mensagens
+recebidas.
+
+Relata percentis de latência por reexecução (geral e por modo), vazão
+(reexecuções/s) e a memória residente do servidor antes, durante e depois
+da carga — o crescimento por sessão é o custo da session_state e dos
+objetos de cada sessão. Com `--estado`, o servidor roda com
+`PRICE_INSTRUMENTACAO=1` e o tamanho da session_state de cada sessão é lido
+do painel de desempenho (o painel em si acrescenta algum custo às
+reexecuções). Roda inteiramente offline.
+
+Uso (a partir da raiz do repositório):
+
+    python -m benchmarks.carga --sessoes 8 --interacoes 30
+    python -m benchmarks.carga --salvar main              # grava baselines/carga-main.json
+    python -m benchmarks.carga --comparar main            # compara com a baseline
+
+As sessões rodam num único processo cliente (asyncio); numa máquina com
+poucos núcleos ele disputa CPU com o servidor, então os números servem para
+comparar versões do código na mesma máquina. Com `--comparar`, o código de
+saída é 1 se p95, vazão ou memória por sessão piorarem mais que `--limite`
+vezes a baseline; também é 1 se alguma reexecução mostrar exceção.
+
+Não há API pública do Streamlit para falar com o servidor como um
+navegador: o cliente monta as mensagens com os protos do Streamlit e usa
+partes internas do `streamlit.testing` (`parse_tree_from_messages`,
+`widget._value`, `widget._widget_state`), que mudam entre versões. Por isso
+as versões ficam fixadas em `benchmarks/requirements.txt` (Streamlit 1.65.x,
+websockets >= 13) e o script se recusa a rodar com outras.
+"""
+import argparse
+import asyncio
+import importlib.metadata
+import json
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_price import PASTA_BASELINES, _commit_atual
+from financeiro import format_brl
+
+RAIZ = Path(__file__).resolve().parent.parent
+APP = RAIZ / "streamlit_app.py"
+PERCENTIS = (50, 90, 95, 99)
+MODO_INICIAL = "Calcular Parcela"
+# (pacote, versão mínima, versão máxima exclusiva ou None); ver benchmarks/requirements.txt
+VERSOES = (("streamlit", (1, 65), (1, 66)), ("websockets", (13,), None))
+
+
+def _money(minimo=500.0, maximo=100_000.0):
+    return lambda rng: format_brl(round(rng.uniform(minimo, maximo), 2))
+
+
+def _percentual(minimo, maximo):
+    return lambda rng: f"{rng.uniform(minimo, maximo):.4f}".replace(".", ",")
+
+
+def _inteiro(minimo, maximo):
+    return lambda rng: rng.randint(minimo, maximo)
+
+
+def _escolha(*opcoes):
+    return lambda rng: rng.choice(opcoes)
+
+
+# modo -> [(tipo de widget, key, gerador de valor)]
+EDICOES = {
+    "Calcular Parcela": [
+        ("text_input", "par_valor_total", _money()),
+        ("text_input", "par_entrada", _money(0.0, 500.0)),
+        ("number_input", "par_num_parcelas", _inteiro(1, 360)),
+        ("text_input", "par_taxa", _percentual(0.1, 8.0)),
+        ("selectbox", "par_taxa_tipo", _escolha("Mensal (%)", "Anual (%)")),
+    ],
+    "Calcular Taxa": [
+        ("number_input", "taxa_valor_total", lambda rng: round(rng.uniform(500.0, 100_000.0), 2)),
+        ("number_input", "taxa_entrada", lambda rng: round(rng.uniform(0.0, 500.0), 2)),
+        ("number_input", "taxa_num_parcelas", _inteiro(1, 360)),
+        ("checkbox", "editar_parcela_taxa", _escolha(True, False)),
+    ],
+    "Calcular Valor Presente": [
+        ("number_input", "pv_num_parcelas", _inteiro(1, 360)),
+        ("selectbox", "pv_taxa_tipo", _escolha("Mensal (%)", "Anual (%)")),
+        ("text_input", "pv_taxa", _percentual(0.1, 8.0)),
+        ("text_input", "pv_parcela", _money()),
+    ],
+}
+
+
+def _memoria(pid):
+    """Memória residente do processo `pid` em bytes (None se não houver como medir)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as status:
+            for linha in status:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(pid).memory_info().rss
+
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ServidorLocal:
+    """`streamlit run` headless numa porta livre, encerrado na saída do `with`."""
+
+    def __init__(self, instrumentacao=False, espera=60.0):
+        self.porta = _porta_livre()
+        self.instrumentacao = instrumentacao
+        self.espera = espera
+        self.processo = None
+        self._log = None
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.porta}/_stcore/stream"
+
+    def memoria(self):
+        return _memoria(self.processo.pid)
+
+    def __enter__(self):
+        env = dict(os.environ)
+        if self.instrumentacao:
+            env["PRICE_INSTRUMENTACAO"] = "1"
+        self._log = tempfile.TemporaryFile()
+        self.processo = subprocess.Popen(
+            [
+                sys.executable, "-m", "streamlit", "run", str(APP),
+                "--server.headless", "true", "--server.port", str(self.porta),
+                "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+                "--logger.level", "error",
+            ],
+            cwd=RAIZ, env=env, stdout=self._log, stderr=subprocess.STDOUT,
+        )
+        limite = time.monotonic() + self.espera
+        while time.monotonic() < limite:
+            if self.processo.poll() is not None:
+                break
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{self.porta}/_stcore/health", timeout=1).read()
+                return self
+            except OSError:
+                time.sleep(0.1)
+        saida = self._saida()
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"Servidor Streamlit não respondeu:\n{saida}")
+
+    def _saida(self):
+        self._log.seek(0)
+        return self._log.read().decode("utf-8", "replace")[-4000:]
+
+    def __exit__(self, *exc):
+        if self.processo is not None and self.processo.poll() is None:
+            self.processo.terminate()
+            try:
+                self.processo.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.processo.kill()
+        if self._log is not None:
+            self._log.close()
+
+
+def _verificar_versoes():
+    """Erro (SystemExit) se streamlit/websockets não estiverem nas versões em que o cliente foi testado."""
+    problemas = []
+    for pacote, minima, maxima in VERSOES:
+        try:
+            instalada = importlib.metadata.version(pacote)
+        except importlib.metadata.PackageNotFoundError:
+            problemas.append(f"{pacote} não instalado")
+            continue
+        numeros = tuple(int(p) for p in re.findall(r"\d+", instalada)[:len(minima)])
+        if numeros < minima or (maxima is not None and numeros >= maxima):
+            problemas.append(f"{pacote} {instalada}")
+    if problemas:
+        raise SystemExit(
+            f"Versões não suportadas pelo teste de carga: {', '.join(problemas)}. "
+            "Instale com: pip install -r benchmarks/requirements.txt"
+        )
+
+
+def _estado_widget(widget):
+    """WidgetState que o navegador mandaria para `widget` com o valor definido por `set_value`."""
+    if widget.type in ("selectbox", "radio"):
+        # a árvore formata a opção pela format_func guardada na session_state do AppTest,
+        # que não existe aqui; as opções destes widgets já são o próprio texto exibido
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        return WidgetState(id=widget.id, string_value=str(widget._value))
+    return widget._widget_state
+
+
+class Sessao:
+    """Uma aba do navegador: websocket próprio e a árvore de elementos da última execução."""
+
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.arvore = None
+        self._ws = None
+        self._mensagens_cache = {}
+
+    async def conectar(self):
+        from websockets.asyncio.client import connect
+
+        self._ws = await connect(self.url, max_size=None)
+
+    async def fechar(self):
+        if self._ws is not None:
+            await self._ws.close()
+
+    async def executar(self, widget=None):
+        """Pede uma reexecução (com o novo valor de `widget`, se houver); devolve a latência em s."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.testing.v1.element_tree import parse_tree_from_messages
+
+        msg = BackMsg()
+        # o servidor guarda os valores dos outros widgets; basta mandar o que mudou
+        msg.rerun_script.widget_states.SetInParent()
+        if widget is not None:
+            msg.rerun_script.widget_states.widgets.append(_estado_widget(widget))
+        inicio = time.perf_counter()
+        await self._ws.send(msg.SerializeToString())
+        mensagens = await asyncio.wait_for(self._receber_execucao(), self.timeout)
+        latencia = time.perf_counter() - inicio
+        self.arvore = parse_tree_from_messages(mensagens)
+        return latencia
+
+    async def _receber_execucao(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        mensagens = []
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self._ws.recv())
+            # mensagens grandes repetidas chegam só como referência ao hash
+            if msg.WhichOneof("type") == "ref_hash":
+                msg = self._mensagens_cache[msg.ref_hash]
+            elif msg.hash:
+                self._mensagens_cache[msg.hash] = msg
+            mensagens.append(msg)
+            if msg.WhichOneof("type") == "script_finished":
+                return mensagens
+
+    def erros(self):
+        return len(self.arvore.exception)
+
+    def estado(self):
+        """(keys, bytes) da session_state lidos do painel de desempenho, ou None sem o painel."""
+        for caption in self.arvore.caption:
+            m = re.match(r"Estado da sessão: (\d+) keys, ~(\d+) bytes", caption.value)
+            if m:
+                return int(m.group(1)), int(m.group(2))
+        return None
+
+
+async def _sessao(indice, url, interacoes, semente, pausa, troca, timeout, medicoes):
+    rng = random.Random(semente * 1_000_003 + indice)
+    sessao = Sessao(url, timeout)
+    await sessao.conectar()
+    try:
+        modo = MODO_INICIAL
+        medicoes.append((modo, "inicio", await sessao.executar(), sessao.erros()))
+        estado_inicio = sessao.estado()
+        for _ in range(interacoes):
+            if pausa:
+                await asyncio.sleep(rng.expovariate(1.0 / pausa))
+            if rng.random() < troca:
+                modo = rng.choice([m for m in EDICOES if m != modo])
+                widget = sessao.arvore.radio(key="modo").set_value(modo)
+                acao = "modo"
+            else:
+                tipo, acao, gerar = rng.choice(EDICOES[modo])
+                widget = getattr(sessao.arvore, tipo)(key=acao).set_value(gerar(rng))
+            medicoes.append((modo, acao, await sessao.executar(widget), sessao.erros()))
+        return estado_inicio, sessao.estado()
+    finally:
+        await sessao.fechar()
+
+
+async def _amostrar_memoria(servidor, amostras, intervalo=0.1):
+    while True:
+        amostras.append(servidor.memoria())
+        await asyncio.sleep(intervalo)
+
+
+def _percentis(valores):
+    if not len(valores):
+        return {}
+    return {f"p{q}": float(v) for q, v in zip(PERCENTIS, np.percentile(valores, PERCENTIS))}
+
+
+async def _carga(servidor, sessoes, interacoes, semente, pausa, troca, timeout):
+    # aquecimento: imports e caches do app ficam fora da memória por sessão
+    aquecimento = Sessao(servidor.url, timeout)
+    await aquecimento.conectar()
+    await aquecimento.executar()
+    await aquecimento.fechar()
+    memoria_base = servidor.memoria()
+
+    medicoes, amostras = [], []
+    amostrador = asyncio.ensure_future(_amostrar_memoria(servidor, amostras))
+    inicio = time.perf_counter()
+    try:
+        estados = await asyncio.gather(*(
+            _sessao(i, servidor.url, interacoes, semente, pausa, troca, timeout, medicoes) for i in range(sessoes)
+        ))
+    finally:
+        amostrador.cancel()
+    duracao = time.perf_counter() - inicio
+    memoria_fim = servidor.memoria()
+    amostras = [m for m in amostras + [memoria_fim] if m is not None]
+    return medicoes, estados, duracao, memoria_base, amostras, memoria_fim
+
+
+def executar(sessoes=8, interacoes=30, semente=0, pausa=0.0, troca=0.2, timeout=60.0, estado=False):
+    """Sobe o servidor, roda `sessoes` sessões simultâneas e devolve o resumo (dict)."""
+    with ServidorLocal(instrumentacao=estado) as servidor:
+        medicoes, estados, duracao, memoria_base, amostras, memoria_fim = asyncio.run(
+            _carga(servidor, sessoes, interacoes, semente, pausa, troca, timeout)
+        )
+
+    # a primeira execução de cada sessão (tabela inicial, sessão nova) fica fora dos percentis
+    reexecucoes = [m for m in medicoes if m[1] != "inicio"]
+    tempos = np.array([m[2] for m in reexecucoes])
+    resumo = {
+        "sessoes": sessoes,
+        "reexecucoes": len(reexecucoes),
+        "erros": sum(m[3] > 0 for m in medicoes),
+        "duracao": duracao,
+        "vazao": len(reexecucoes) / duracao,
+        "latencia": {**_percentis(tempos), "media": float(tempos.mean()), "max": float(tempos.max())} if len(tempos) else {},
+        "latencia_inicio": _percentis(np.array([m[2] for m in medicoes if m[1] == "inicio"])),
+        "latencia_por_modo": {modo: _percentis(np.array([m[2] for m in reexecucoes if m[0] == modo])) for modo in EDICOES},
+        "memoria_base": memoria_base,
+        "memoria_pico": max(amostras) if amostras else None,
+        "memoria_fim": memoria_fim,
+        "memoria_por_sessao": (memoria_fim - memoria_base) / sessoes if None not in (memoria_base, memoria_fim) else None,
+    }
+    fins = [fim for _, fim in estados if fim is not None]
+    if fins:
+        inicios = [ini for ini, _ in estados if ini is not None]
+        resumo["estado_inicio"] = float(np.mean([b for _, b in inicios])) if inicios else None
+        resumo["estado_fim"] = float(np.mean([b for _, b in fins]))
+        resumo["estado_fim_max"] = max(b for _, b in fins)
+        resumo["keys_fim"] = float(np.mean([k for k, _ in fins]))
+    return resumo
+
+
+def _ms(segundos):
+    return f"{segundos * 1000:8.1f} ms"
+
+
+def _mib(n):
+    return "n/d" if n is None else f"{n / 2**20:,.1f} MiB"
+
+
+def _kib(n):
+    return "n/d" if n is None else f"{n / 1024:,.1f} KiB"
+
+
+def imprimir(r):
+    print(f"{r['sessoes']} sessões, {r['reexecucoes']} reexecuções em {r['duracao']:.1f} s — "
+          f"{r['vazao']:.1f} reexecuções/s, {r['erros']} com erro")
+    lat = r["latencia"]
+    if lat:
+        print("latência   " + "  ".join(f"{k}: {_ms(lat[k])}" for k in (*(f"p{q}" for q in PERCENTIS), "max")))
+    for modo, p in r["latencia_por_modo"].items():
+        if p:
+            print(f"  {modo:24s} " + "  ".join(f"{k}: {_ms(v)}" for k, v in p.items()))
+    if r["latencia_inicio"]:
+        print(f"primeira execução da sessão: p50 {_ms(r['latencia_inicio']['p50'])}")
+    print(f"memória do servidor: {_mib(r['memoria_base'])} após o aquecimento, pico {_mib(r['memoria_pico'])}, "
+          f"{_mib(r['memoria_fim'])} no fim ({_kib(r['memoria_por_sessao'])} por sessão)")
+    if "estado_fim" in r:
+        print(f"session_state por sessão: {_kib(r['estado_inicio'])} no início, {_kib(r['estado_fim'])} no fim "
+              f"(máx. {_kib(r['estado_fim_max'])}, {r['keys_fim']:.0f} keys)")
+
+
+def _comparar(r, base, limite):
+    """Nomes das métricas que pioraram mais que `limite` vezes a baseline."""
+    razoes = {
+        "latência p95": r["latencia"]["p95"] / base["latencia"]["p95"],
+        "vazão": base["vazao"] / r["vazao"],
+    }
+    if r["memoria_por_sessao"] is not None and base.get("memoria_por_sessao") is not None:
+        # crescimento pequeno é ruído do alocador: comparar a partir de 64 KiB
+        razoes["memória/sessão"] = max(r["memoria_por_sessao"], 65536) / max(base["memoria_por_sessao"], 65536)
+    piores = []
+    for nome, razao in razoes.items():
+        regressao = razao > limite
+        print(f"{nome:15s} {razao:5.2f}x a baseline" + ("  <-- regressão" if regressao else ""))
+        if regressao:
+            piores.append(nome)
+    return piores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga local do app Streamlit (várias sessões simultâneas).")
+    parser.add_argument("--sessoes", type=int, default=8, help="sessões simultâneas (padrão: 8)")
+    parser.add_argument("--interacoes", type=int, default=30, help="edições por sessão (padrão: 30)")
+    parser.add_argument("--pausa", type=float, default=0.0, help="pausa média entre edições, em s (padrão: 0, sem pausa)")
+    parser.add_argument("--troca", type=float, default=0.2, help="probabilidade de trocar de calculadora a cada interação")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="tempo máximo por reexecução, em s")
+    parser.add_argument("--estado", action="store_true", help="medir a session_state pelo painel de desempenho")
+    parser.add_argument("--salvar", metavar="NOME", help="grava o resumo em benchmarks/baselines/carga-NOME.json")
+    parser.add_argument("--comparar", metavar="NOME", help="compara com benchmarks/baselines/carga-NOME.json")
+    parser.add_argument("--limite", type=float, default=1.25, help="razão máxima aceita na comparação (padrão: 1.25)")
+    args = parser.parse_args(argv)
+
+    _verificar_versoes()
+    r = executar(args.sessoes, args.interacoes, args.semente, args.pausa, args.troca, args.timeout, args.estado)
+    imprimir(r)
+
+    codigo = 1 if r["erros"] else 0
+    if args.comparar:
+        base = json.loads((PASTA_BASELINES / f"carga-{args.comparar}.json").read_text(encoding="utf-8"))
+        print()
+        comparaveis = ("sessoes", "interacoes", "pausa", "troca", "semente", "estado")
+        diferentes = [p for p in comparaveis if base["parametros"].get(p) != getattr(args, p)]
+        if diferentes:
+            print(f"Atenção: a baseline foi gravada com outros parâmetros ({', '.join(diferentes)})")
+        if _comparar(r, base["resumo"], args.limite):
+            codigo = 1
+    if args.salvar:
+        PASTA_BASELINES.mkdir(exist_ok=True)
+        destino = PASTA_BASELINES / f"carga-{args.salvar}.json"
+        destino.write_text(json.dumps({
+            "commit": _commit_atual(),
+            "python": platform.python_version(),
+            "maquina": platform.platform(),
+            "parametros": vars(args),
+            "resumo": r,
+        }, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResumo gravado em {destino}")
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Cálculos do sistema PRICE sem dependência do Streamlit.
+
+Pode ser usado por jobs em lote, APIs e linha de comando: importar o pacote
+carrega apenas NumPy; pandas só é importado pelas funções que devolvem
+DataFrame.
+"""
+from .centavos import LoteCentavos, tabela_centavos_lote, tabela_price_centavos
+from .cronograma import Cronograma, cronograma_price, cronogramas_lote
+from .numeros import (
+    ResultadoParse,
+    format_brl,
+    formatar_brl_array,
+    formato_moeda,
+    parse_brl_array,
+    parse_number,
+    parse_number_string,
+)
+from .price import (
+    COLUNAS_PRICE,
+    LotePrice,
+    fator_anuidade,
+    parcela_price,
+    tabela_price,
+    tabela_price_longa,
+    tabela_price_lote,
+    valor_presente_price,
+)
+from .taxa import ResultadoTaxa, taxa_price, taxa_price_lote
@@ -0,0 +1,35 @@
+"""Redução do número de pontos de séries longas para gráficos (LTTB)."""
+import numpy as np
+
+
+def lttb(x, y, limite: int) -> np.ndarray:
+    """Índices dos pontos escolhidos pelo Largest-Triangle-Three-Buckets.
+
+    Mantém o primeiro e o último ponto e, em cada um dos `limite - 2` baldes
+    intermediários, o ponto que forma o maior triângulo com o ponto já
+    escolhido no balde anterior e a média do balde seguinte. Preserva picos e
+    o formato visual da curva com bem menos pontos. Se a série já tem até
+    `limite` pontos, devolve todos os índices.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if limite >= n or limite < 3:
+        return np.arange(n)
+
+    # limites dos baldes intermediários (o primeiro e o último ponto ficam fora)
+    bordas = np.linspace(1, n - 1, limite - 1).astype(np.int64)
+    escolhidos = np.empty(limite, dtype=np.int64)
+    escolhidos[0] = 0
+    escolhidos[-1] = n - 1
+    anterior = 0
+    for b in range(limite - 2):
+        ini, fim = bordas[b], bordas[b + 1]
+        prox_ini, prox_fim = fim, (bordas[b + 2] if b + 2 < len(bordas) else n)
+        media_x = x[prox_ini:prox_fim].mean()
+        media_y = y[prox_ini:prox_fim].mean()
+        ax, ay = x[anterior], y[anterior]
+        areas = np.abs((ax - media_x) * (y[ini:fim] - ay) - (ax - x[ini:fim]) * (media_y - ay))
+        anterior = ini + int(np.argmax(areas))
+        escolhidos[b + 1] = anterior
+    return escolhidos
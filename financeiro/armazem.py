@@ -0,0 +1,134 @@
+"""Armazém em disco, mapeado em memória, das tabelas PRICE de uma carteira.
+
+Layout de um diretório de armazém:
+
+- `meta.json`: versão, nº de empréstimos, nº total de linhas e colunas;
+- `parcela.f64`, `juros.f64`, `amortizacao.f64`, `saldo.f64`: uma coluna
+  por arquivo (float64 nativo), com as tabelas de todos os empréstimos
+  concatenadas na ordem da carteira;
+- `offsets.i64`: L + 1 posições; o empréstimo i ocupa as linhas
+  offsets[i]:offsets[i+1] (o período é a posição dentro desse trecho);
+- `parametros.f64`: L x 3 com (rate, nper, pv) de cada empréstimo.
+
+Os valores são os de `tabela_price` (absolutos). A gravação é feita em
+blocos de empréstimos; a leitura usa `np.memmap`, então abrir o armazém é
+instantâneo e só as páginas tocadas são lidas do disco.
+"""
+import json
+import os
+
+import numpy as np
+
+from .cronograma import Cronograma
+from .price import tabela_price_lote
+
+VERSAO = 1
+COLUNAS_ARMAZEM = ("parcela", "juros", "amortizacao", "saldo")
+
+
+def _caminho(diretorio, nome):
+    return os.path.join(diretorio, nome)
+
+
+def _abrir(diretorio, nome, dtype, shape):
+    # np.memmap não aceita arquivo vazio
+    if not np.prod(shape):
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(_caminho(diretorio, nome), dtype=dtype, mode="r", shape=shape)
+
+
+def gravar_armazem(diretorio, rates, npers, pvs, tamanho_bloco=1000) -> int:
+    """Gera as tabelas PRICE da carteira e grava o armazém em `diretorio`.
+
+    O consumo de memória depende só de `tamanho_bloco`. `meta.json` é
+    escrito por último: um armazém sem ele está incompleto. Retorna o número
+    de linhas gravadas.
+    """
+    if tamanho_bloco < 1:
+        raise ValueError("Tamanho do bloco deve ser maior que zero")
+    rates, npers, pvs = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(rates, dtype=float)),
+        np.atleast_1d(np.asarray(npers)),
+        np.atleast_1d(np.asarray(pvs, dtype=float)),
+    )
+    os.makedirs(diretorio, exist_ok=True)
+    meta = _caminho(diretorio, "meta.json")
+    if os.path.exists(meta):
+        os.remove(meta)
+
+    arquivos = {c: open(_caminho(diretorio, f"{c}.f64"), "wb") for c in COLUNAS_ARMAZEM}
+    offsets = [np.zeros(1, dtype=np.int64)]
+    linhas = 0
+    try:
+        for inicio in range(0, len(rates), tamanho_bloco):
+            fim = inicio + tamanho_bloco
+            lote = tabela_price_lote(rates[inicio:fim], npers[inicio:fim], pvs[inicio:fim])
+            mascara = lote.mascara
+            for coluna, valores in zip(COLUNAS_ARMAZEM, (lote.parcela, lote.juros, lote.amortizacao, lote.saldo)):
+                np.abs(valores[mascara]).astype(np.float64).tofile(arquivos[coluna])
+            offsets.append(linhas + np.cumsum(lote.nper))
+            linhas += int(lote.nper.sum())
+    finally:
+        for arquivo in arquivos.values():
+            arquivo.close()
+
+    np.concatenate(offsets).astype(np.int64).tofile(_caminho(diretorio, "offsets.i64"))
+    np.column_stack([rates, npers.astype(float), pvs]).astype(np.float64).tofile(_caminho(diretorio, "parametros.f64"))
+    with open(meta, "w", encoding="utf-8") as arquivo:
+        json.dump({"versao": VERSAO, "emprestimos": len(rates), "linhas": linhas, "colunas": list(COLUNAS_ARMAZEM)}, arquivo)
+    return linhas
+
+
+class ArmazemPrice:
+    """Leitura de um armazém gravado por `gravar_armazem` (somente leitura, via memmap)."""
+
+    __slots__ = ("diretorio", "emprestimos", "linhas", "offsets", "parametros", "_colunas")
+
+    def __init__(self, diretorio):
+        try:
+            with open(_caminho(diretorio, "meta.json"), encoding="utf-8") as arquivo:
+                meta = json.load(arquivo)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"'{diretorio}' não é um armazém completo (falta meta.json)") from None
+        if meta.get("versao") != VERSAO:
+            raise ValueError(f"Versão de armazém não suportada: {meta.get('versao')}")
+        self.diretorio = diretorio
+        self.emprestimos = int(meta["emprestimos"])
+        self.linhas = int(meta["linhas"])
+        self.offsets = _abrir(diretorio, "offsets.i64", np.int64, (self.emprestimos + 1,))
+        self.parametros = _abrir(diretorio, "parametros.f64", np.float64, (self.emprestimos, 3))
+        self._colunas = {}
+
+    def __len__(self):
+        return self.emprestimos
+
+    def coluna(self, nome) -> np.ndarray:
+        """Coluna inteira (todas as linhas de todos os empréstimos) como memmap."""
+        if nome not in COLUNAS_ARMAZEM:
+            raise KeyError(f"Coluna desconhecida: {nome!r} (use {', '.join(COLUNAS_ARMAZEM)})")
+        if nome not in self._colunas:
+            self._colunas[nome] = _abrir(self.diretorio, f"{nome}.f64", np.float64, (self.linhas,))
+        return self._colunas[nome]
+
+    def cronograma(self, i) -> Cronograma:
+        """Tabela do empréstimo `i` (lê só as linhas dele)."""
+        if not -self.emprestimos <= i < self.emprestimos:
+            raise IndexError(f"Empréstimo {i} fora do armazém ({self.emprestimos} empréstimos)")
+        i %= self.emprestimos
+        ini, fim = int(self.offsets[i]), int(self.offsets[i + 1])
+        return Cronograma(np.stack([self.coluna(c)[ini:fim] for c in COLUNAS_ARMAZEM]))
+
+    def somas(self, nome, tamanho_bloco=100_000) -> np.ndarray:
+        """Soma de `nome` por empréstimo (ex: juros totais), lendo a coluna em blocos de empréstimos."""
+        coluna = self.coluna(nome)
+        resultado = np.empty(self.emprestimos, dtype=np.float64)
+        for inicio in range(0, self.emprestimos, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, self.emprestimos)
+            base, limite = int(self.offsets[inicio]), int(self.offsets[fim])
+            resultado[inicio:fim] = np.add.reduceat(coluna[base:limite], np.asarray(self.offsets[inicio:fim]) - base)
+        return resultado
+
+    def total(self, nome, tamanho_bloco=10_000_000) -> float:
+        """Soma de `nome` em toda a carteira, em blocos de linhas."""
+        coluna = self.coluna(nome)
+        return float(sum(coluna[i:i + tamanho_bloco].sum() for i in range(0, self.linhas, tamanho_bloco)))
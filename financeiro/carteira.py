@@ -0,0 +1,147 @@
+"""Projeção mensal do fluxo de caixa de uma carteira de empréstimos PRICE.
+
+Cada empréstimo tem mês de início (contratação), valor financiado, taxa
+mensal e prazo; a parcela k vence no mês início + k. A projeção soma, mês a
+mês, parcelas recebidas, juros, amortização e saldo devedor de toda a
+carteira.
+
+As tabelas são geradas por `tabela_price_lote` em blocos de empréstimos e
+acumuladas com `np.bincount` (scatter-add) num eixo de calendário, sem
+montar DataFrames por empréstimo: a memória depende do tamanho do bloco e
+do número de meses, não do tamanho da carteira. Blocos podem vir de um
+iterável (ex: `pd.read_csv(..., chunksize=...)`), então carteiras com
+milhões de empréstimos não precisam caber na memória.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from .numeros import parse_brl_array
+from .price import tabela_price_lote
+
+COLUNAS_CARTEIRA = ["inicio", "valor", "taxa", "parcelas"]
+COLUNAS_PROJECAO = ["Mês", "Parcelas", "Juros", "Amortização", "Saldo Devedor"]
+
+
+class ProjecaoCarteira(NamedTuple):
+    """Fluxo mensal agregado da carteira; `meses` é datetime64[M]."""
+    meses: np.ndarray
+    parcelas: np.ndarray
+    juros: np.ndarray
+    amortizacao: np.ndarray
+    saldo: np.ndarray
+
+    def para_pandas(self):
+        """pandas.DataFrame com as colunas de `COLUNAS_PROJECAO` (Mês como 'AAAA-MM')."""
+        import pandas as pd
+
+        return pd.DataFrame(dict(zip(COLUNAS_PROJECAO, (
+            self.meses.astype(str), self.parcelas, self.juros, self.amortizacao, self.saldo,
+        ))))
+
+
+def _meses(inicios) -> np.ndarray:
+    """Meses (datetime64[M], 'AAAA-MM' ou datas) como inteiros desde 1970-01."""
+    return np.asarray(inicios, dtype="datetime64[M]").astype(np.int64)
+
+
+class _Acumulador:
+    """Somas por mês num eixo que cresce conforme os blocos chegam."""
+
+    def __init__(self):
+        self.primeiro = None
+        self.somas = np.zeros((4, 0))
+
+    def _garantir(self, menor, maior):
+        if self.primeiro is None:
+            self.primeiro = menor
+        novo_primeiro = min(self.primeiro, menor)
+        tamanho = max(self.primeiro + self.somas.shape[1], maior + 1) - novo_primeiro
+        if novo_primeiro != self.primeiro or tamanho != self.somas.shape[1]:
+            somas = np.zeros((4, tamanho))
+            ini = self.primeiro - novo_primeiro
+            somas[:, ini:ini + self.somas.shape[1]] = self.somas
+            self.primeiro, self.somas = novo_primeiro, somas
+
+    def adicionar(self, meses, rates, npers, pvs):
+        lote = tabela_price_lote(rates, npers, pvs)
+        mascara = lote.mascara
+        self._garantir(int(meses.min()), int((meses + lote.nper).max()))
+        # coluna de cada célula (empréstimo, período k) no eixo de calendário
+        posicao = (meses - self.primeiro)[:, None] + lote.periodos[None, :]
+        posicao = posicao[mascara]
+        m = self.somas.shape[1]
+        self.somas[0] += np.bincount(posicao, weights=lote.parcela[mascara], minlength=m)
+        self.somas[1] += np.bincount(posicao, weights=lote.juros[mascara], minlength=m)
+        self.somas[2] += np.bincount(posicao, weights=lote.amortizacao[mascara], minlength=m)
+        self.somas[3] += np.bincount(posicao, weights=lote.saldo[mascara], minlength=m)
+        # no mês da contratação o saldo é o valor financiado
+        self.somas[3] += np.bincount(meses - self.primeiro, weights=np.broadcast_to(pvs, meses.shape).astype(float), minlength=m)
+
+    def resultado(self) -> ProjecaoCarteira:
+        if self.primeiro is None:
+            vazio = np.zeros(0)
+            return ProjecaoCarteira(np.zeros(0, dtype="datetime64[M]"), vazio, vazio, vazio, vazio)
+        meses = (self.primeiro + np.arange(self.somas.shape[1])).astype("datetime64[M]")
+        return ProjecaoCarteira(meses, *self.somas.copy())
+
+
+def projetar_blocos(blocos, tamanho_bloco=10_000) -> ProjecaoCarteira:
+    """Projeção a partir de um iterável de blocos (inicios, pvs, rates, npers).
+
+    Blocos maiores que `tamanho_bloco` empréstimos são divididos: é o que
+    limita a memória (tabelas de tamanho_bloco x maior prazo).
+    """
+    if tamanho_bloco < 1:
+        raise ValueError("Tamanho do bloco deve ser maior que zero")
+    acumulador = _Acumulador()
+    for inicios, pvs, rates, npers in blocos:
+        meses = np.atleast_1d(_meses(inicios))
+        rates, npers, pvs = (np.broadcast_to(np.asarray(x), meses.shape) for x in (rates, npers, pvs))
+        for i in range(0, len(meses), tamanho_bloco):
+            fatia = slice(i, i + tamanho_bloco)
+            acumulador.adicionar(meses[fatia], rates[fatia].astype(float), npers[fatia], pvs[fatia].astype(float))
+    return acumulador.resultado()
+
+
+def blocos_csv(arquivo, sep=",", tamanho_bloco=100_000):
+    """Lê uma carteira em CSV, em blocos, no formato esperado por `projetar_blocos`.
+
+    Colunas: inicio ('AAAA-MM'), valor (R$, aceita '1.234,56'), taxa (% ao
+    mês, ex: 2,5) e parcelas. Levanta ValueError se faltar coluna ou houver
+    valor inválido (inclusive valor <= 0, taxa <= -100% ou parcelas que não
+    sejam inteiras e positivas).
+    """
+    import pandas as pd
+
+    for bloco in pd.read_csv(arquivo, sep=sep, dtype=str, chunksize=tamanho_bloco):
+        bloco.columns = [str(c).strip().lower() for c in bloco.columns]
+        faltando = [c for c in COLUNAS_CARTEIRA if c not in bloco.columns]
+        if faltando:
+            raise ValueError(f"Colunas ausentes no arquivo: {', '.join(faltando)}")
+        valores = parse_brl_array(bloco["valor"].to_numpy())
+        taxas = parse_brl_array(bloco["taxa"].to_numpy())
+        parcelas = parse_brl_array(bloco["parcelas"].to_numpy())
+        invalidos = np.union1d(np.union1d(valores.invalidos, taxas.invalidos), parcelas.invalidos)
+        with np.errstate(invalid="ignore"):
+            # taxa <= -100% faria fator_anuidade dar NaN, que contaminaria todos os meses
+            fora = (valores.valores <= 0) | (taxas.valores <= -100.0)
+            fora |= (parcelas.valores < 1) | (parcelas.valores != np.floor(parcelas.valores))
+        invalidos = np.union1d(invalidos, np.flatnonzero(fora))
+        if invalidos.size:
+            linha = int(bloco.index[invalidos[0]]) + 2  # + cabeçalho, base 1
+            raise ValueError(f"Valor inválido na linha {linha} do arquivo")
+        try:
+            inicios = np.asarray(bloco["inicio"].str.strip().to_numpy(), dtype="datetime64[M]")
+        except ValueError:
+            raise ValueError("Coluna 'inicio' deve estar no formato AAAA-MM") from None
+        yield inicios, valores.valores, taxas.valores / 100.0, parcelas.valores
+
+
+def projetar_carteira(inicios, pvs, rates, npers, tamanho_bloco=10_000) -> ProjecaoCarteira:
+    """Projeção mensal da carteira (arrays 1-D de mesmo tamanho), processada em blocos.
+
+    `inicios`: mês de contratação (datetime64[M] ou 'AAAA-MM'); `rates`: taxa
+    mensal (ex: 0.02); a primeira parcela vence no mês seguinte ao início.
+    """
+    return projetar_blocos([(inicios, pvs, rates, npers)], tamanho_bloco)
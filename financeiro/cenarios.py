@@ -0,0 +1,92 @@
+"""Precificação em lote de cenários no estilo de `juros.py`.
+
+Cada cenário tem valor total, entrada e número de parcelas, e informa ou o
+valor da parcela (a taxa é inferida, como no cenário do cartão) ou a taxa
+mensal em % (a parcela é calculada, como no cenário do boleto).
+"""
+import numpy as np
+
+from .numeros import parse_brl_array
+from .price import parcela_price
+from .taxa import taxa_price_lote
+
+COLUNAS_ENTRADA = ["valor_total", "entrada", "parcelas", "parcela", "taxa"]
+COLUNAS_SAIDA = [
+    "valor_financiado",
+    "taxa",
+    "parcela",
+    "total_pago",
+    "juros_totais",
+    "total_com_entrada",
+    "taxa_total",
+    "taxa_acumulada",
+    "ok",
+]
+
+
+def precificar_cenarios(df):
+    """Calcula taxa, parcela e métricas de juros para cada linha de `df`.
+
+    Colunas esperadas: valor_total, parcelas e, opcionalmente, entrada
+    (padrão 0), parcela (R$) e taxa (% ao mês), numéricas ou como texto no
+    formato brasileiro. Linhas com parcela têm a taxa inferida; as demais
+    usam a taxa informada. Retorna um novo DataFrame com as colunas de
+    entrada seguidas de `COLUNAS_SAIDA`; `ok` é False quando a linha não tem
+    dados suficientes ou a taxa não pôde ser encontrada.
+    """
+    import pandas as pd
+
+    n = len(df)
+
+    def coluna(nome):
+        # aceita números ou textos em formato BR ("R$ 1.234,56"); inválidos viram NaN
+        if nome not in df.columns:
+            return np.full(n, np.nan)
+        return parse_brl_array(df[nome]).valores
+
+    valor_total = coluna("valor_total")
+    entrada = np.nan_to_num(coluna("entrada"), nan=0.0)
+    parcelas = coluna("parcelas")
+    parcela = coluna("parcela")
+    taxa = coluna("taxa") / 100.0
+
+    valor_financiado = np.maximum(0.0, valor_total - entrada)
+    ok = np.isfinite(valor_financiado) & np.isfinite(parcelas) & (parcelas >= 1) & (parcelas == np.floor(parcelas))
+    ok &= entrada <= valor_total
+
+    # cenário "cartão": parcela informada -> inferir a taxa
+    inferir = ok & np.isfinite(parcela)
+    if inferir.any():
+        resultado = taxa_price_lote(parcelas[inferir], parcela[inferir], valor_financiado[inferir])
+        taxa[inferir] = resultado.taxa
+        ok[inferir] = resultado.convergiu
+
+    # cenário "boleto": taxa informada -> calcular a parcela
+    calcular = ok & ~inferir & np.isfinite(taxa) & (taxa > -1)
+    ok &= inferir | calcular
+    parcela = np.where(calcular, np.nan, parcela)
+    if calcular.any():
+        parcela[calcular] = parcela_price(taxa[calcular], parcelas[calcular], valor_financiado[calcular])
+
+    total_pago = parcela * parcelas
+    juros_totais = total_pago - valor_financiado
+    with np.errstate(divide="ignore", invalid="ignore"):
+        taxa_total = np.where(valor_financiado != 0, juros_totais / valor_financiado * 100.0, 0.0)
+        taxa_acumulada = np.expm1(parcelas * np.log1p(taxa)) * 100.0
+
+    saida = {
+        "valor_financiado": valor_financiado,
+        "taxa": taxa * 100.0,
+        "parcela": parcela,
+        "total_pago": total_pago,
+        "juros_totais": juros_totais,
+        "total_com_entrada": entrada + total_pago,
+        "taxa_total": taxa_total,
+        "taxa_acumulada": taxa_acumulada,
+    }
+    for coluna, valores in saida.items():
+        saida[coluna] = np.where(ok, valores, np.nan)
+    saida["ok"] = ok
+
+    base = df.drop(columns=[c for c in ("taxa", "parcela") if c in df.columns])
+    return pd.concat([base.reset_index(drop=True), pd.DataFrame(saida, index=range(n))], axis=1)
@@ -0,0 +1,146 @@
+"""Tabela PRICE em centavos inteiros, com arredondamento bancário.
+
+Boletos são emitidos em centavos: a parcela é arredondada, os juros de cada
+período são arredondados sobre o saldo em centavos e a diferença acumulada
+vai para a última parcela, de modo que a soma das amortizações é exatamente
+o valor financiado e o saldo final é exatamente zero.
+
+Os erros de arredondamento (da parcela e dos juros) são capitalizados até
+o vencimento; com taxas altas e prazos longos eles crescem como (1+r)^n e
+a última parcela ficaria muito diferente das demais, ou o saldo ficaria
+negativo. Por isso, a cada período projeta-se a última parcela mantendo a
+parcela em vigor; só quando ela se afastaria mais que `RESIDUO_MAXIMO` da
+parcela em vigor a parcela é recalculada sobre o saldo e o prazo restantes.
+
+Tudo em arrays int64, vetorizado sobre os empréstimos; o laço é só sobre
+os períodos (no máximo o maior prazo do lote).
+"""
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+import numpy as np
+
+from .price import COLUNAS_PRICE, fator_anuidade
+
+ARREDONDAMENTOS = ("meio_para_cima", "meio_para_par")
+# afastamento máximo da última parcela projetada, como fração da parcela em vigor
+RESIDUO_MAXIMO = 0.05
+
+
+def arredondar(valores, modo="meio_para_cima") -> np.ndarray:
+    """Arredonda para inteiro (int64).
+
+    "meio_para_cima": metades para longe do zero (2,5 -> 3; -2,5 -> -3);
+    "meio_para_par": metades para o par mais próximo (2,5 -> 2; 3,5 -> 4).
+    """
+    valores = np.asarray(valores, dtype=float)
+    if modo == "meio_para_cima":
+        return (np.sign(valores) * np.floor(np.abs(valores) + 0.5)).astype(np.int64)
+    if modo == "meio_para_par":
+        return np.rint(valores).astype(np.int64)
+    raise ValueError(f"Arredondamento desconhecido: {modo!r} (use {', '.join(ARREDONDAMENTOS)})")
+
+
+class LoteCentavos(NamedTuple):
+    """Tabelas PRICE em centavos (int64, empréstimo x período).
+
+    Depois do último período de cada empréstimo os valores são 0; use
+    `mascara` para separar os períodos válidos.
+    """
+    parcela: np.ndarray
+    juros: np.ndarray
+    amortizacao: np.ndarray
+    saldo: np.ndarray
+    nper: np.ndarray
+
+    @property
+    def periodos(self):
+        return np.arange(1, self.parcela.shape[1] + 1)
+
+    @property
+    def mascara(self):
+        """Máscara booleana dos períodos válidos de cada empréstimo."""
+        return self.periodos[None, :] <= self.nper[:, None]
+
+
+def tabela_centavos_lote(rates, npers, pvs_centavos, arredondamento="meio_para_cima") -> LoteCentavos:
+    """Tabelas PRICE de vários empréstimos em centavos inteiros.
+
+    `pvs_centavos` é o valor financiado em centavos (inteiro). A parcela é
+    PV / a(r, n) arredondada; em cada período os juros são o saldo vezes a
+    taxa, arredondados, a amortização é parcela - juros e, no último
+    período, a amortização é o saldo restante (a última parcela absorve a
+    diferença dos arredondamentos). Mantida a parcela P, a última parcela
+    projetada a partir do saldo S com m parcelas restantes é
+    (S - P a(r, m - 1)) (1+r)^m; se ela se afastar de P mais que
+    `RESIDUO_MAXIMO` x P (e mais que um centavo), a parcela passa a ser
+    S / a(r, m), arredondada. Assim o saldo nunca fica negativo, e na
+    prática só empréstimos com taxa alta e prazo longo mudam de parcela.
+    """
+    rates, npers, pvs = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(rates, dtype=float)),
+        np.atleast_1d(np.asarray(npers)),
+        np.atleast_1d(np.asarray(pvs_centavos)),
+    )
+    if rates.ndim != 1:
+        raise ValueError("rates, npers e pvs devem ser escalares ou arrays 1-D")
+    if np.any(npers < 1) or np.any(npers != np.floor(npers)):
+        raise ValueError("Número de parcelas deve ser inteiro e maior que zero")
+    if np.any(pvs != np.round(pvs)):
+        raise ValueError("Valor financiado deve estar em centavos inteiros")
+    if np.any(rates <= -1):
+        raise ValueError("Taxas devem ser maiores que -100%")
+    arredondar(0.0, arredondamento)  # valida o modo antes do laço
+    npers = npers.astype(np.int64)
+    pvs = pvs.astype(np.int64)
+
+    pmt = arredondar(pvs / fator_anuidade(rates, npers), arredondamento)
+    total = int(npers.max())
+    # preenchido por período (linhas contíguas) e transposto no fim
+    parcela, juros, amortizacao, saldo = (np.zeros((total, len(npers)), dtype=np.int64) for _ in range(4))
+
+    atual = pvs.copy()
+    for k in range(total):
+        ativos = npers > k
+        restantes = npers - k
+        # na última parcela não há o que projetar: ela fecha o saldo
+        i = np.flatnonzero(restantes >= 2)
+        if i.size:
+            with np.errstate(over="ignore", invalid="ignore"):
+                ultima = (atual[i] - pmt[i] * fator_anuidade(rates[i], restantes[i] - 1)) * np.exp(restantes[i] * np.log1p(rates[i]))
+            fora = i[np.abs(ultima - pmt[i]) > np.maximum(RESIDUO_MAXIMO * np.abs(pmt[i]), 1.0)]
+            if fora.size:
+                pmt[fora] = arredondar(atual[fora] / fator_anuidade(rates[fora], restantes[fora]), arredondamento)
+        j = arredondar(atual * rates, arredondamento)
+        j[~ativos] = 0
+        a = pmt - j
+        a[~ativos] = 0
+        ultimo = npers == k + 1
+        a[ultimo] = atual[ultimo]
+        atual -= a
+        juros[k] = j
+        amortizacao[k] = a
+        parcela[k] = j + a
+        saldo[k] = atual
+    parcela, juros, amortizacao, saldo = (np.ascontiguousarray(x.T) for x in (parcela, juros, amortizacao, saldo))
+    return LoteCentavos(parcela, juros, amortizacao, saldo, npers)
+
+
+def tabela_price_centavos(rate, nper, pv, arredondamento="meio_para_cima"):
+    """Tabela PRICE de um empréstimo como `tabela_price`, mas fechada em centavos.
+
+    `pv` em reais (arredondado para centavos pela sua representação
+    decimal, então 0.285 vira 29 centavos); as colunas em reais são
+    múltiplos exatos de R$ 0,01 e o saldo final é 0.
+    """
+    import pandas as pd
+
+    arredondar(0.0, arredondamento)  # valida o modo
+    modo = ROUND_HALF_UP if arredondamento == "meio_para_cima" else ROUND_HALF_EVEN
+    pv_centavos = int((Decimal(str(pv)) * 100).quantize(Decimal(1), rounding=modo))
+    lote = tabela_centavos_lote(rate, nper, pv_centavos, arredondamento)
+    colunas = (lote.periodos, lote.parcela[0], lote.juros[0], lote.amortizacao[0], lote.saldo[0])
+    return pd.DataFrame({
+        nome: coluna if nome == "Período" else coluna / 100.0
+        for nome, coluna in zip(COLUNAS_PRICE, colunas)
+    })
@@ -0,0 +1,128 @@
+"""Cotação das três calculadoras (parcela, taxa e PV) a partir de dicionários.
+
+Mesmas regras das abas do app, num formato que serve a APIs: cada item é
+um dict com os campos da calculadora e o resultado é outro dict. Um lote
+inteiro é calculado de forma vetorizada; itens inválidos voltam com a
+chave "erro" em vez de derrubar o lote.
+
+Campos de entrada (valores em R$ e taxas em % por período):
+
+- parcela: valor_total, entrada (0), parcelas, taxa, taxa_tipo ("mensal")
+- taxa: valor_total, entrada (0), parcelas, parcela
+- pv: parcelas, taxa, taxa_tipo ("mensal"), parcela
+"""
+import math
+
+import numpy as np
+
+from .price import parcela_price, valor_presente_price
+from .taxa import taxa_price_lote
+
+OPERACOES = ("parcela", "taxa", "pv")
+
+
+def _coluna(itens, nome, padrao=None):
+    valores = []
+    for i, item in enumerate(itens):
+        valor = item.get(nome, padrao)
+        if valor is None:
+            raise ValueError(f"Item {i}: campo '{nome}' é obrigatório")
+        try:
+            valores.append(float(valor))
+        except (TypeError, ValueError):
+            raise ValueError(f"Item {i}: campo '{nome}' deve ser numérico") from None
+    return np.array(valores, dtype=float)
+
+
+def _prazos(itens):
+    n = _coluna(itens, "parcelas")
+    invalidos = np.flatnonzero((n < 1) | (n > 360) | (n != np.round(n)))
+    if invalidos.size:
+        raise ValueError(f"Item {int(invalidos[0])}: 'parcelas' deve ser inteiro entre 1 e 360")
+    return n.astype(np.int64)
+
+
+def _taxas(itens):
+    taxa = _coluna(itens, "taxa") / 100.0
+    tipos = [str(item.get("taxa_tipo", "mensal")).lower() for item in itens]
+    for i, tipo in enumerate(tipos):
+        if tipo not in ("mensal", "anual"):
+            raise ValueError(f"Item {i}: 'taxa_tipo' deve ser 'mensal' ou 'anual'")
+    # como nas abas: taxa anual informada vira mensal dividindo por 12
+    return np.where(np.array(tipos) == "anual", taxa / 12.0, taxa)
+
+
+def _com_erro(erro, condicao, mensagem):
+    """Marca `mensagem` onde `condicao` vale, sem apagar um erro anterior do mesmo item."""
+    return np.where(condicao & np.equal(erro, None), mensagem, erro)
+
+
+def _financiado(itens):
+    valor_total = _coluna(itens, "valor_total")
+    entrada = _coluna(itens, "entrada", 0.0)
+    erro = np.where(entrada > valor_total, "Entrada não pode ser maior que o valor total", None)
+    return np.maximum(0.0, valor_total - entrada), erro
+
+
+def _parcela(itens):
+    pv, erro = _financiado(itens)
+    n = _prazos(itens)
+    rate = _taxas(itens)
+    erro = _com_erro(erro, rate <= -1, "Taxa deve ser maior que -100%")
+    pmt = parcela_price(rate, n, pv)
+    total = pmt * n
+    return erro, {
+        "valor_financiado": pv,
+        "parcela": pmt,
+        "total_pago": total,
+        "juros_totais": total - pv,
+        "taxa_mensal": rate * 100.0,
+    }
+
+
+def _taxa(itens):
+    pv, erro = _financiado(itens)
+    n = _prazos(itens)
+    pmt = _coluna(itens, "parcela")
+    resultado = taxa_price_lote(n, pmt, pv)
+    erro = _com_erro(erro, ~resultado.convergiu, "Não há taxa que produza essa parcela")
+    rate = resultado.taxa
+    return erro, {
+        "valor_financiado": pv,
+        "taxa_mensal": rate * 100.0,
+        "taxa_anual": np.expm1(12.0 * np.log1p(rate)) * 100.0,
+    }
+
+
+def _pv(itens):
+    n = _prazos(itens)
+    rate = _taxas(itens)
+    pmt = _coluna(itens, "parcela")
+    erro = np.where(rate <= -1, "Taxa deve ser maior que -100%", None)
+    pv = valor_presente_price(rate, n, pmt)
+    return erro, {"valor_presente": pv, "taxa_mensal": rate * 100.0}
+
+
+_CALCULOS = {"parcela": _parcela, "taxa": _taxa, "pv": _pv}
+
+
+def cotar(operacao, itens) -> list:
+    """Calcula `operacao` ("parcela", "taxa" ou "pv") para uma lista de itens (dicts).
+
+    Levanta ValueError para operação desconhecida ou campos ausentes/mal
+    formatados; itens cujo cálculo não tem solução voltam como {"erro": ...}.
+    """
+    if operacao not in _CALCULOS:
+        raise ValueError(f"Operação desconhecida: {operacao!r} (use {', '.join(OPERACOES)})")
+    if not itens:
+        return []
+    with np.errstate(all="ignore"):
+        erros, colunas = _CALCULOS[operacao](itens)
+    nomes = list(colunas)
+    linhas = zip(*(colunas[nome].tolist() for nome in nomes))
+    resultado = []
+    for erro, valores in zip(erros.tolist(), linhas):
+        if erro is None and not all(math.isfinite(v) for v in valores):
+            erro = "Resultado não finito para os valores informados"
+        resultado.append({"erro": erro} if erro is not None else dict(zip(nomes, valores)))
+    return resultado
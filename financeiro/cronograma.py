@@ -0,0 +1,88 @@
+"""Tabela PRICE compacta: um bloco contíguo de float64 em vez de DataFrame.
+
+Um `Cronograma` guarda parcela, juros, amortização e saldo como as quatro
+linhas de um único array (4 x n) de float64 — 32 bytes por período — e
+expõe cada coluna como uma view somente leitura, sem cópia. O DataFrame só
+é montado em `para_pandas()`, na hora de exibir ou exportar. Serve para
+manter muitas tabelas em memória (comparações, exportação em lote).
+"""
+import numpy as np
+
+from .price import COLUNAS_PRICE, tabela_price_lote
+
+_PARCELA, _JUROS, _AMORTIZACAO, _SALDO = range(4)
+
+
+class Cronograma:
+    """Tabela PRICE de um empréstimo em arrays contíguos (valores absolutos, como `tabela_price`)."""
+
+    __slots__ = ("_dados",)
+
+    def __init__(self, dados):
+        dados = np.ascontiguousarray(dados, dtype=np.float64)
+        if dados.ndim != 2 or dados.shape[0] != 4:
+            raise ValueError("Cronograma espera um array 4 x n (parcela, juros, amortização, saldo)")
+        dados.flags.writeable = False
+        self._dados = dados
+
+    def __len__(self):
+        return self._dados.shape[1]
+
+    def __repr__(self):
+        return f"Cronograma(nper={len(self)}, parcela={self.parcela[0] if len(self) else float('nan'):.2f})"
+
+    @property
+    def nper(self) -> int:
+        return len(self)
+
+    @property
+    def periodos(self) -> np.ndarray:
+        return np.arange(1, len(self) + 1)
+
+    @property
+    def parcela(self) -> np.ndarray:
+        return self._dados[_PARCELA]
+
+    @property
+    def juros(self) -> np.ndarray:
+        return self._dados[_JUROS]
+
+    @property
+    def amortizacao(self) -> np.ndarray:
+        return self._dados[_AMORTIZACAO]
+
+    @property
+    def saldo(self) -> np.ndarray:
+        return self._dados[_SALDO]
+
+    @property
+    def dados(self) -> np.ndarray:
+        """O bloco 4 x n inteiro (somente leitura)."""
+        return self._dados
+
+    @property
+    def nbytes(self) -> int:
+        return self._dados.nbytes
+
+    def escalado(self, fator) -> "Cronograma":
+        """Mesma tabela com todos os valores multiplicados por `fator` (ex: outro PV)."""
+        return Cronograma(self._dados * float(fator))
+
+    def para_pandas(self):
+        """pandas.DataFrame com as colunas de `tabela_price` (cópia dos arrays)."""
+        import pandas as pd
+
+        return pd.DataFrame(dict(zip(COLUNAS_PRICE, (self.periodos, self.parcela, self.juros, self.amortizacao, self.saldo))))
+
+
+def cronograma_price(rate, nper, pv) -> Cronograma:
+    """Tabela PRICE de um empréstimo como `Cronograma`."""
+    lote = tabela_price_lote(rate, nper, pv)
+    return Cronograma(np.abs(np.stack([lote.parcela[0], lote.juros[0], lote.amortizacao[0], lote.saldo[0]])))
+
+
+def cronogramas_lote(rates, npers, pvs) -> list:
+    """Um `Cronograma` por empréstimo, cada um só com os seus períodos (sem o NaN do lote)."""
+    lote = tabela_price_lote(rates, npers, pvs)
+    bloco = np.abs(np.stack([lote.parcela, lote.juros, lote.amortizacao, lote.saldo]))
+    return [Cronograma(bloco[:, i, :n]) for i, n in enumerate(lote.nper.tolist())]
@@ -0,0 +1,86 @@
+"""Exportação em fluxo (CSV/Parquet) de tabelas PRICE de muitos empréstimos.
+
+As tabelas são geradas em blocos de empréstimos e gravadas incrementalmente,
+de modo que o consumo de memória depende apenas do tamanho do bloco e não do
+tamanho da carteira.
+"""
+import numpy as np
+
+from .price import COLUNAS_PRICE, tabela_price_lote
+
+COLUNAS_EXPORTACAO = ["Empréstimo"] + COLUNAS_PRICE
+
+
+def gerar_blocos_price(rates, npers, pvs, tamanho_bloco=1000):
+    """Gera as tabelas PRICE em formato longo, um bloco de empréstimos por vez.
+
+    Cada bloco é um dict {coluna: array 1-D} com as colunas de
+    `COLUNAS_EXPORTACAO`; a coluna "Empréstimo" é a posição do empréstimo na
+    entrada completa.
+    """
+    if tamanho_bloco < 1:
+        raise ValueError("Tamanho do bloco deve ser maior que zero")
+    rates, npers, pvs = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(rates, dtype=float)),
+        np.atleast_1d(np.asarray(npers)),
+        np.atleast_1d(np.asarray(pvs, dtype=float)),
+    )
+    for inicio in range(0, len(rates), tamanho_bloco):
+        fim = inicio + tamanho_bloco
+        lote = tabela_price_lote(rates[inicio:fim], npers[inicio:fim], pvs[inicio:fim])
+        mascara = lote.mascara
+        emprestimo = np.arange(inicio, inicio + len(lote.nper))
+        yield {
+            "Empréstimo": np.broadcast_to(emprestimo[:, None], mascara.shape)[mascara],
+            "Período": np.broadcast_to(lote.periodos[None, :], mascara.shape)[mascara],
+            "Parcela": lote.parcela[mascara],
+            "Juros": lote.juros[mascara],
+            "Amortização": lote.amortizacao[mascara],
+            "Saldo Devedor": lote.saldo[mascara],
+        }
+
+
+def exportar_csv(destino, rates, npers, pvs, tamanho_bloco=1000, float_format=None):
+    """Grava as tabelas PRICE de todos os empréstimos em CSV, bloco a bloco.
+
+    `destino` pode ser um caminho ou um arquivo de texto aberto;
+    `float_format` (ex: "%.2f") é repassado ao pandas. Retorna o número de
+    linhas gravadas (sem contar o cabeçalho).
+    """
+    import pandas as pd
+
+    fechar = not hasattr(destino, "write")
+    arquivo = open(destino, "w", encoding="utf-8", newline="") if fechar else destino
+    linhas = 0
+    try:
+        arquivo.write(",".join(COLUNAS_EXPORTACAO) + "\n")
+        for bloco in gerar_blocos_price(rates, npers, pvs, tamanho_bloco):
+            pd.DataFrame(bloco).to_csv(arquivo, header=False, index=False, lineterminator="\n", float_format=float_format)
+            linhas += len(bloco["Período"])
+    finally:
+        if fechar:
+            arquivo.close()
+    return linhas
+
+
+def exportar_parquet(destino, rates, npers, pvs, tamanho_bloco=1000):
+    """Grava as tabelas PRICE em Parquet, um row group por bloco de empréstimos.
+
+    Requer o pacote opcional `pyarrow`. Retorna o número de linhas gravadas.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Exportar em Parquet requer o pacote 'pyarrow' (pip install pyarrow)") from e
+
+    esquema = pa.schema(
+        [("Empréstimo", pa.int64()), ("Período", pa.int64())]
+        + [(c, pa.float64()) for c in COLUNAS_PRICE[1:]]
+    )
+    linhas = 0
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for bloco in gerar_blocos_price(rates, npers, pvs, tamanho_bloco):
+            escritor.write_table(pa.table(bloco, schema=esquema))
+            linhas += len(bloco["Período"])
+    return linhas
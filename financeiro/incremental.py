@@ -0,0 +1,75 @@
+"""Reavaliação incremental: só recalcula o que depende das entradas que mudaram.
+
+Um `AvaliadorIncremental` é um pequeno grafo de dependências. Entradas são
+valores simples (ex: rate, nper, pv); nós são funções das entradas ou de
+outros nós. Cada entrada e cada nó têm uma versão; um nó só é recalculado
+quando a versão de alguma dependência muda desde o último cálculo.
+
+`grafo_price()` monta o grafo da tabela PRICE sobre o cache compartilhado de
+`financeiro.memo`: os nós guardam só referências aos objetos do cache (a
+mesma tabela e o mesmo CSV servem a todas as sessões) e, com as entradas
+inalteradas, nem a consulta ao cache é refeita. Como saldos, juros e
+amortização são lineares no valor presente, mudar apenas o PV (ex: a
+entrada) só reescala a tabela de PV = 1 já calculada para (rate, nper).
+"""
+from .memo import csv_price, tabela_price_cache
+
+
+class AvaliadorIncremental:
+    """Grafo de dependências com memoização por versão das dependências."""
+
+    def __init__(self):
+        self._funcoes = {}  # nó -> (dependências, função)
+        self._valores = {}  # entrada ou nó -> valor
+        self._versoes = {}  # entrada ou nó -> versão
+        self._calculado_com = {}  # nó -> versões das dependências no último cálculo
+        self.recalculos = {}  # nó -> quantas vezes foi (re)calculado
+
+    def no(self, nome, dependencias, funcao):
+        """Registra o nó `nome` = funcao(*valores das dependências)."""
+        self._funcoes[nome] = (tuple(dependencias), funcao)
+        self.recalculos.setdefault(nome, 0)
+        return self
+
+    def definir(self, **entradas):
+        """Atualiza entradas; a versão só muda se o valor for diferente do anterior."""
+        for nome, valor in entradas.items():
+            if nome in self._funcoes:
+                raise ValueError(f"'{nome}' é um nó calculado, não uma entrada")
+            if nome not in self._valores or self._valores[nome] != valor:
+                self._valores[nome] = valor
+                self._versoes[nome] = self._versoes.get(nome, 0) + 1
+        return self
+
+    def obter(self, nome):
+        """Valor atual de `nome`, recalculando-o (e suas dependências) só se preciso."""
+        if nome not in self._funcoes:
+            if nome not in self._valores:
+                raise KeyError(f"Entrada '{nome}' não definida")
+            return self._valores[nome]
+        dependencias, funcao = self._funcoes[nome]
+        valores = [self.obter(d) for d in dependencias]
+        versoes = tuple(self._versoes[d] for d in dependencias)
+        if self._calculado_com.get(nome) != versoes:
+            self._valores[nome] = funcao(*valores)
+            self._versoes[nome] = self._versoes.get(nome, 0) + 1
+            self._calculado_com[nome] = versoes
+            self.recalculos[nome] += 1
+        return self._valores[nome]
+
+
+def grafo_price() -> AvaliadorIncremental:
+    """Grafo com entradas rate, nper e pv e os nós:
+
+    - "tabela": DataFrame igual a `tabela_price(rate, nper, pv)`;
+    - "csv": bytes do CSV da tabela.
+
+    Ambos vêm do cache compartilhado (`memo.tabela_price_cache`,
+    `memo.csv_price`); outros nós por (rate, nper, pv) podem ser
+    acrescentados com `.no(...)`.
+    """
+    return (
+        AvaliadorIncremental()
+        .no("tabela", ("rate", "nper", "pv"), tabela_price_cache)
+        .no("csv", ("rate", "nper", "pv"), csv_price)
+    )
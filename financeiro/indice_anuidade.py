@@ -0,0 +1,114 @@
+"""Tabela pré-calculada do fator de anuidade a(r, n) = (1 - (1+r)^-n) / r para cotações avulsas.
+
+Com um único empréstimo, o custo das funções vetorizadas é quase todo
+overhead do NumPy (~16 µs para `parcela_price`).
+Aqui ficam versões escalares em Python puro: `parcela_rapida` e
+`valor_presente_rapido` usam a fórmula fechada com `math`, e `taxa_rapida`
+localiza a taxa por busca binária na linha do prazo de uma tabela de a(r, n)
+(taxas de 0 a `TAXA_MAX` com passo `PASSO` x prazos 1..`PRAZO_MAX`) e refina
+com poucos passos de Newton dentro do intervalo encontrado.
+
+A tabela é construída em memória na primeira cotação (~30 ms) e reaproveitada
+pelo processo; o que cair fora dela volta para `taxa_price`.
+"""
+import math
+
+import numpy as np
+
+from .taxa import _anuidade_e_derivada_escalar
+
+PASSO = 1e-4
+TAXA_MAX = 0.20
+PRAZO_MAX = 360
+
+
+class IndiceAnuidade:
+    """Tabela de a(r, n): uma linha por prazo 0..prazo_max, uma coluna por taxa 0, h, 2h, ..."""
+
+    __slots__ = ("passo", "fatores")
+
+    def __init__(self, passo, fatores):
+        self.passo = float(passo)
+        self.fatores = fatores
+
+    @property
+    def prazo_max(self) -> int:
+        return self.fatores.shape[0] - 1
+
+    @classmethod
+    def construir(cls, passo=PASSO, taxa_max=TAXA_MAX, prazo_max=PRAZO_MAX) -> "IndiceAnuidade":
+        """Calcula a tabela como somas acumuladas de v^k, com v = 1/(1+r)."""
+        taxas = passo * np.arange(int(round(taxa_max / passo)) + 1)
+        k = np.arange(1, prazo_max + 1)[:, None]
+        fatores = np.zeros((prazo_max + 1, len(taxas)))
+        fatores[1:] = np.cumsum((1.0 + taxas[None, :]) ** -k, axis=0)
+        return cls(passo, fatores)
+
+    def taxa_escalar(self, nper, pmt, pv, tol=1e-12, passos=8):
+        """Taxa de um único empréstimo em Python puro: busca binária na linha do prazo + Newton.
+
+        Devolve None quando a taxa está fora da grade ou não converge (use `taxa_price`).
+        """
+        if nper != int(nper) or not 1 <= nper <= self.prazo_max or pmt <= 0 or pv <= 0:
+            return None
+        linha = self.fatores[int(nper)]
+        alvo = pv / pmt
+        lo, hi = 0, len(linha) - 1
+        if not linha[hi] <= alvo <= linha[lo]:
+            return None
+        while hi - lo > 1:
+            meio = (lo + hi) // 2
+            if linha[meio] >= alvo:
+                lo = meio
+            else:
+                hi = meio
+        f_lo, f_hi = float(linha[lo]), float(linha[hi])
+        r_lo, r_hi = lo * self.passo, hi * self.passo
+        r = r_lo + (f_lo - alvo) / (f_lo - f_hi) * self.passo if f_lo > f_hi else r_lo
+        for _ in range(passos):
+            fator, derivada = _anuidade_e_derivada_escalar(r, nper)
+            f = fator - alvo
+            if abs(f) <= tol * alvo:
+                return r
+            novo = min(max(r - f / derivada, r_lo), r_hi)
+            if abs(novo - r) <= tol * max(1.0, r):
+                return novo
+            r = novo
+        return None
+
+
+def _fator_escalar(rate, nper):
+    if rate == 0:
+        return float(nper)
+    return -math.expm1(-nper * math.log1p(rate)) / rate
+
+
+def parcela_rapida(rate, nper, pv) -> float:
+    """Parcela PRICE de um único empréstimo (escalar, Python puro)."""
+    return pv / _fator_escalar(rate, nper)
+
+
+def valor_presente_rapido(rate, nper, pmt) -> float:
+    """Valor presente PRICE de um único empréstimo (escalar, Python puro)."""
+    return pmt * _fator_escalar(rate, nper)
+
+
+def taxa_rapida(nper, pmt, pv) -> float:
+    """Taxa por período de um único empréstimo pelo índice padrão, com `taxa_price` como reserva."""
+    taxa = obter_indice().taxa_escalar(nper, pmt, pv)
+    if taxa is None:
+        from .taxa import taxa_price
+
+        return taxa_price(nper, pmt, pv)
+    return taxa
+
+
+_indices = {}
+
+
+def obter_indice(passo=PASSO, taxa_max=TAXA_MAX, prazo_max=PRAZO_MAX) -> IndiceAnuidade:
+    """Tabela da grade pedida, construída na primeira chamada e mantida em memória."""
+    chave = (float(passo), float(taxa_max), int(prazo_max))
+    if chave not in _indices:
+        _indices[chave] = IndiceAnuidade.construir(passo, taxa_max, prazo_max)
+    return _indices[chave]
@@ -0,0 +1,149 @@
+"""Medição opcional do tempo de cada fase das abas (entrada, cálculo, tabela, gráficos...).
+
+Desativada por padrão: ative com a variável de ambiente PRICE_INSTRUMENTACAO=1
+ou com `ativar()`. Quando desativada, `fase()` e `medicao()` não fazem nada
+além de um teste de flag.
+
+Cada execução de uma aba gera uma `Medicao` com a duração de cada fase; as
+medições são acumuladas em contadores por (aba, fase), registradas como uma
+linha JSON no logger "financeiro.instrumentacao" e podem ser exportadas no
+formato texto do Prometheus com `exportar_prometheus()`.
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("financeiro.instrumentacao")
+
+_ativa = os.environ.get("PRICE_INSTRUMENTACAO", "") not in ("", "0")
+_atual = contextvars.ContextVar("medicao_atual", default=None)
+_lock = threading.Lock()
+_execucoes = {}  # aba -> nº de execuções
+_fases = {}  # (aba, fase) -> [nº de medições, segundos]
+_ultimas = deque(maxlen=100)
+
+
+@dataclass
+class Medicao:
+    """Durações (em segundos) das fases de uma execução de uma aba."""
+    aba: str
+    inicio: float = field(default_factory=time.time)
+    fases: dict = field(default_factory=dict)
+    total: float = 0.0
+
+    def como_dict(self) -> dict:
+        return {"aba": self.aba, "inicio": self.inicio, "total": self.total, "fases": dict(self.fases)}
+
+
+def ativar(ligada: bool = True):
+    global _ativa
+    _ativa = ligada
+
+
+def ativa() -> bool:
+    return _ativa
+
+
+@contextmanager
+def medicao(aba: str):
+    """Mede uma execução completa de `aba`; as chamadas a `fase()` dentro dela são registradas nela."""
+    if not _ativa:
+        yield None
+        return
+    atual = Medicao(aba)
+    token = _atual.set(atual)
+    inicio = time.perf_counter()
+    try:
+        yield atual
+    finally:
+        atual.total = time.perf_counter() - inicio
+        _atual.reset(token)
+        _registrar(atual)
+
+
+@contextmanager
+def fase(nome: str):
+    """Mede o tempo de uma fase da medição ativa (não faz nada fora de `medicao()`)."""
+    atual = _atual.get()
+    if atual is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        atual.fases[nome] = atual.fases.get(nome, 0.0) + time.perf_counter() - inicio
+
+
+def instrumentado(aba: str):
+    """Decorador que envolve a função (ex: `render_parcela`) numa `medicao(aba)`."""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with medicao(aba):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
+
+
+def _registrar(atual: Medicao):
+    with _lock:
+        _execucoes[atual.aba] = _execucoes.get(atual.aba, 0) + 1
+        for nome, segundos in atual.fases.items():
+            contagem = _fases.setdefault((atual.aba, nome), [0, 0.0])
+            contagem[0] += 1
+            contagem[1] += segundos
+        _ultimas.append(atual)
+    logger.info(json.dumps(atual.como_dict(), ensure_ascii=False))
+
+
+def ultimas_medicoes(aba: str = None) -> list:
+    """Medições mais recentes (da mais antiga para a mais nova), opcionalmente só de `aba`."""
+    with _lock:
+        return [m for m in _ultimas if aba is None or m.aba == aba]
+
+
+def resumo() -> list:
+    """Lista de dicts {aba, fase, execucoes, segundos, media} acumulados desde o início."""
+    with _lock:
+        return [
+            {"aba": aba, "fase": nome, "execucoes": n, "segundos": s, "media": s / n}
+            for (aba, nome), (n, s) in sorted(_fases.items())
+        ]
+
+
+def exportar_prometheus() -> str:
+    """Contadores acumulados no formato texto de exposição do Prometheus."""
+    linhas = [
+        "# HELP price_execucoes_total Execuções de cada aba.",
+        "# TYPE price_execucoes_total counter",
+    ]
+    with _lock:
+        execucoes = sorted(_execucoes.items())
+        fases = sorted(_fases.items())
+    linhas += [f'price_execucoes_total{{aba="{aba}"}} {n}' for aba, n in execucoes]
+    linhas += [
+        "# HELP price_fase_segundos_total Tempo acumulado em cada fase das abas.",
+        "# TYPE price_fase_segundos_total counter",
+    ]
+    linhas += [f'price_fase_segundos_total{{aba="{aba}",fase="{nome}"}} {s:.9f}' for (aba, nome), (_, s) in fases]
+    linhas += [
+        "# HELP price_fase_medicoes_total Quantas vezes cada fase foi medida.",
+        "# TYPE price_fase_medicoes_total counter",
+    ]
+    linhas += [f'price_fase_medicoes_total{{aba="{aba}",fase="{nome}"}} {n}' for (aba, nome), (n, _) in fases]
+    return "\n".join(linhas) + "\n"
+
+
+def limpar():
+    with _lock:
+        _execucoes.clear()
+        _fases.clear()
+        _ultimas.clear()
@@ -0,0 +1,174 @@
+"""Cache LRU compartilhado para a tabela PRICE e os artefatos derivados.
+
+O Streamlit reexecuta o script inteiro a cada interação; como este módulo é
+importado uma única vez por processo, o cache é compartilhado entre todas as
+sessões. Os objetos devolvidos são compartilhados e não devem ser modificados.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from .instrumentacao import fase
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .cronograma import Cronograma
+    from .simulacao import ResultadoSimulacao
+
+
+_FALTA = object()
+
+
+class CacheLRU:
+    """Mapa com tamanho máximo e descarte do item usado há mais tempo (LRU).
+
+    Seguro para uso concorrente; conta acertos (hits) e faltas (misses).
+    """
+
+    def __init__(self, capacidade: int = 128):
+        if capacidade < 1:
+            raise ValueError("Capacidade do cache deve ser maior que zero")
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def obter(self, chave, calcular):
+        """Devolve o valor de `chave`, chamando `calcular()` e guardando-o em caso de falta."""
+        valor = self.consultar(chave, _FALTA)
+        if valor is _FALTA:
+            # calcular fora do lock para não serializar sessões diferentes
+            valor = calcular()
+            self.guardar(chave, valor)
+        return valor
+
+    def consultar(self, chave, padrao=None):
+        """Valor de `chave` sem calcular nada (`padrao` em caso de falta, que é contada)."""
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.hits += 1
+                return self._itens[chave]
+            self.misses += 1
+            return padrao
+
+    def guardar(self, chave, valor):
+        """Guarda `valor` (para valores calculados fora de `obter`, ex: de forma assíncrona)."""
+        with self._lock:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def valores(self) -> list:
+        """Cópia da lista de valores guardados (para inspeção, ex: medir memória)."""
+        with self._lock:
+            return list(self._itens.values())
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "tamanho": len(self._itens),
+                "capacidade": self.capacidade,
+            }
+
+
+_cache = CacheLRU(int(os.environ.get("PRICE_CACHE_TAMANHO", "256")))
+# resultados de simulação têm até alguns MiB cada: cache próprio e pequeno,
+# para não ocupar (nem expulsar) as tabelas do cache principal
+_cache_simulacao = CacheLRU(int(os.environ.get("PRICE_SIMULACAO_CACHE", "8")))
+
+
+def _chave(rate, nper, pv):
+    return (float(rate), int(nper), float(pv))
+
+
+def cronograma_unitario(rate, nper) -> "Cronograma":
+    """`Cronograma` da tabela PRICE com PV = 1, com cache.
+
+    Como a tabela é linear no valor presente, qualquer PV é só essa base
+    multiplicada por |pv| (ver `tabela_price_cache`).
+    """
+    from .cronograma import cronograma_price
+
+    def gerar():
+        with fase("tabela"):
+            return cronograma_price(rate, nper, 1.0)
+    return _cache.obter(("unitaria", float(rate), int(nper)), gerar)
+
+
+def tabela_price_cache(rate, nper, pv) -> "pd.DataFrame":
+    """Versão com cache de `tabela_price` (o DataFrame é compartilhado).
+
+    Gerada reescalando `cronograma_unitario(rate, nper)`: outro PV com a
+    mesma taxa e prazo não recalcula a tabela.
+    """
+    def gerar():
+        unitario = cronograma_unitario(rate, nper)
+        with fase("escala"):
+            return unitario.escalado(abs(float(pv))).para_pandas()
+    return _cache.obter(("tabela", *_chave(rate, nper, pv)), gerar)
+
+
+def csv_price(rate, nper, pv) -> bytes:
+    """CSV (UTF-8) de `tabela_price_cache`, com cache."""
+    def gerar():
+        df = tabela_price_cache(rate, nper, pv)
+        with fase("csv"):
+            return df.to_csv(index=False).encode("utf-8")
+    return _cache.obter(("csv", *_chave(rate, nper, pv)), gerar)
+
+
+def simulacao_price(rate, nper, pv, pre_pagamento, inadimplencia, recuperacao, caminhos, semente, emprestimos=1) -> "ResultadoSimulacao":
+    """Simulação de Monte Carlo (`simulacao.simular_carteira`) com cache.
+
+    A carteira tem `emprestimos` empréstimos iguais, com eventos
+    independentes; mesmos parâmetros e semente dão o mesmo resultado.
+    """
+    import numpy as np
+
+    from .simulacao import simular_carteira
+
+    chave = (
+        "simulacao", *_chave(rate, nper, pv), float(pre_pagamento), float(inadimplencia),
+        float(recuperacao), int(caminhos), int(semente), int(emprestimos),
+    )
+
+    def gerar():
+        with fase("simulacao"):
+            return simular_carteira(
+                np.full(emprestimos, rate), np.full(emprestimos, nper), np.full(emprestimos, pv),
+                pre_pagamento, inadimplencia, recuperacao, caminhos, semente,
+            )
+    return _cache_simulacao.obter(chave, gerar)
+
+
+def estatisticas() -> dict:
+    """Contadores de acertos/faltas e ocupação do cache compartilhado de tabelas."""
+    return _cache.estatisticas()
+
+
+def estatisticas_simulacao() -> dict:
+    """Contadores de acertos/faltas e ocupação do cache de simulações."""
+    return _cache_simulacao.estatisticas()
+
+
+def valores_em_cache() -> list:
+    """Objetos guardados nos caches compartilhados (são de todas as sessões)."""
+    return _cache.valores() + _cache_simulacao.valores()
+
+
+def limpar_cache():
+    _cache.limpar()
+    _cache_simulacao.limpar()
@@ -0,0 +1,242 @@
+"""Conversão e formatação de valores monetários no formato brasileiro."""
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+
+def formato_moeda(x):
+    """Formata número como moeda BR (R$) usando vírgula como separador decimal.
+
+    Retorna o próprio valor se não for numérico.
+    """
+    return f"R$ {format_brl(x)}" if isinstance(x, (int, float, np.floating, np.integer)) else x
+
+
+def parse_number(value):
+    """Tenta parsear uma entrada que pode conter vírgula como separador decimal."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float, np.floating, np.integer)):
+        return float(value)
+    # remover espaços e trocar vírgula por ponto
+    try:
+        s = str(value).strip().replace('.', '').replace(',', '.')
+        return float(s)
+    except Exception:
+        return None
+
+
+
+def format_brl(value: float) -> str:
+    # formata com separador de milhares '.' e decimal ',' (ex: 1.234,56)
+    # milhares com '_' no f-string: basta trocar '.' -> ',' e depois '_' -> '.'
+    return f"{value:_.2f}".replace('.', ',').replace('_', '.')
+
+
+def parse_number_string(s: str) -> float:
+    if s is None:
+        raise ValueError("Valor vazio")
+    s = str(s).strip()
+    if s == "":
+        raise ValueError("Valor vazio")
+    # remover R$ se presente
+    s = s.replace('R$', '').strip()
+    # se contém vírgula, assumir formato BR: milhares com '.' e decimal com ','
+    if ',' in s:
+        # remover pontos de milhares
+        s = s.replace('.', '')
+        # trocar vírgula por ponto decimal
+        s = s.replace(',', '.')
+    # caso contrário, assume-se ponto como decimal
+    # remover espaços
+    s = s.replace(' ', '')
+    try:
+        return float(s)
+    except Exception:
+        raise ValueError(f"Não foi possível interpretar '{s}' como número")
+
+
+class ResultadoParse(NamedTuple):
+    """Resultado de `parse_brl_array`: valores (NaN onde inválido) e posições inválidas."""
+    valores: np.ndarray
+    invalidos: np.ndarray
+
+
+# até 15 dígitos a mantissa é exata em float64
+_MAX_DIGITOS = 15
+_POTENCIAS = 10 ** np.arange(1, 19, dtype=np.int64)
+
+
+def _tabela_pesos():
+    # por código de caractere, um contador de 8 bits por classe (espaços não contam):
+    # dígitos | pontos << 8 | vírgulas << 16 | sinais << 24 | "R" << 32 | "$" << 40 | outros << 48
+    pesos = np.full(256, 1 << 48, dtype=np.uint64)
+    pesos[[0, ord(" "), 0xA0]] = 0
+    pesos[ord("0"):ord("9") + 1] = 1
+    pesos[ord(".")] = 1 << 8
+    pesos[ord(",")] = 1 << 16
+    pesos[[ord("-"), ord("+")]] = 1 << 24
+    pesos[ord("R")] = 1 << 32
+    pesos[ord("$")] = 1 << 40
+    return pesos
+
+
+_PESOS = _tabela_pesos()
+
+
+def _parse_matriz(textos: np.ndarray):
+    """Caminho rápido de `parse_brl_array` sobre os códigos dos caracteres.
+
+    `textos` é um array 1-D de str (dtype "U"), lido como uma matriz de
+    códigos de caractere. Uma consulta a `_PESOS` e uma soma por texto dão
+    quantos dígitos, separadores, sinais e outros caracteres há em cada
+    texto; a mantissa é acumulada em inteiro coluna a coluna (Horner) e as
+    casas decimais são os dígitos depois do separador. Devolve (valores,
+    reconhecidos); linhas fora do formato simples (sinal inicial, dígitos,
+    um separador decimal, pontos de milhar, "R$" e espaços) ficam com
+    reconhecidos = False, para o caminho lento.
+    """
+    n = len(textos)
+    largura = textos.dtype.itemsize // 4
+    if n == 0 or not 0 < largura < 256:
+        return np.full(n, np.nan), np.zeros(n, dtype=bool)
+    # transposta (posição x texto): as contas por texto viram operações entre linhas contíguas
+    # códigos acima de 255 viram 255 ("ÿ"), que conta como outro caractere
+    c = np.ascontiguousarray(np.minimum(textos.view(np.uint32).reshape(n, largura), 255).astype(np.uint8).T)
+
+    contagens = _PESOS[c].sum(axis=0)
+    digitos = contagens & 0xFF
+    pontos, virgulas, sinais = ((contagens >> b) & 0xFF for b in (8, 16, 24))
+    erres, cifroes, outros = ((contagens >> b) & 0xFF for b in (32, 40, 48))
+    # com vírgula: formato BR (milhares com '.', decimal com ','); sem vírgula: '.' é o decimal
+    com_virgula = virgulas > 0
+    reconhecidos = (
+        (outros == 0) & (erres == cifroes) & (sinais <= 1)
+        & (np.where(com_virgula, virgulas, pontos) <= 1) & (digitos >= 1) & (digitos <= _MAX_DIGITOS)
+    )
+    if erres.any():
+        # "R" e "$" só como "R$"
+        pares = ((c[:-1] == ord("R")) & (c[1:] == ord("$"))).sum(axis=0)
+        reconhecidos &= pares == erres
+    negativo = np.zeros(n, dtype=bool)
+    com_sinal = np.flatnonzero(reconhecidos & (sinais == 1))
+    if com_sinal.size:
+        # o sinal só vale como primeiro caractere que não é espaço nem "R$"
+        sub = c[:, com_sinal]
+        ignorar = (_PESOS[sub] == 0) | (sub == ord("R")) | (sub == ord("$"))
+        primeiro = sub[np.argmax(~ignorar, axis=0), np.arange(com_sinal.size)]
+        reconhecidos[com_sinal] = (primeiro == ord("-")) | (primeiro == ord("+"))
+        negativo[com_sinal] = primeiro == ord("-")
+
+    d = c - np.uint8(ord("0"))
+    eh_digito = d < 10
+    d[~eh_digito] = 0
+    multiplicador = np.where(eh_digito, 10.0, 1.0)
+    separador = c == np.where(com_virgula, ord(","), ord(".")).astype(np.uint8)
+    mantissa = np.zeros(n)
+    casas = np.zeros(n, dtype=np.int64)
+    depois = np.zeros(n, dtype=bool)
+    for j in range(largura):
+        mantissa *= multiplicador[j]
+        mantissa += d[j]
+        casas += eh_digito[j] & depois
+        depois |= separador[j]
+    # mantissa < 10^15 é exata em float64: a divisão dá o float mais próximo do decimal
+    valores = mantissa / np.concatenate([[1], _POTENCIAS])[casas]
+    valores[negativo] *= -1.0
+    return np.where(reconhecidos, valores, np.nan), reconhecidos
+
+
+def parse_brl_array(valores) -> ResultadoParse:
+    """Versão vetorizada de `parse_number_string` para colunas inteiras.
+
+    Aceita uma sequência (lista, array ou pandas.Series) de números ou textos
+    como "R$ 1.234,56", "1234,56" ou "1234.56". Entradas vazias, não finitas
+    ("inf", "nan") ou que não puderem ser interpretadas não lançam exceção:
+    ficam NaN em `valores` e suas posições (0-based) são listadas em
+    `invalidos`.
+
+    Textos no formato usual são convertidos sem passar por objetos Python,
+    numa matriz de códigos de caractere (ver `_parse_matriz`); só o que
+    sobrar (ex: notação científica) é convertido um a um pelo pandas.
+    """
+    arr = np.asarray(valores)
+    if arr.dtype.kind in "iuf":
+        resultado = arr.astype(float).ravel()
+    else:
+        # números viram seu texto ("2.5"); None/NA viram "None"/"<NA>", que são inválidos
+        textos = (arr if arr.dtype.kind == "U" else arr.astype(str)).ravel()
+        resultado, reconhecidos = _parse_matriz(textos)
+        resto = np.flatnonzero(~reconhecidos)
+        if resto.size:
+            import pandas as pd
+
+            texto = pd.Series(textos[resto], dtype="string")
+            # remover R$ e espaços (inclusive não separáveis, comuns em planilhas)
+            for trecho in ("R$", " ", "\xa0"):
+                texto = texto.str.replace(trecho, "", regex=False)
+            com_virgula = texto.str.contains(",", regex=False).fillna(False)
+            texto = texto.where(~com_virgula, texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+            resultado[resto] = pd.to_numeric(texto, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    resultado[~np.isfinite(resultado)] = np.nan
+    invalidos = np.flatnonzero(np.isnan(resultado))
+    return ResultadoParse(resultado, invalidos)
+
+
+# acima disso os centavos deixam de ser exatos em float64: formatar um a um
+_LIMITE_CENTAVOS = 2.0 ** 52
+# abaixo disso o custo fixo das operações do NumPy supera o f-string por valor
+_MINIMO_VETORIZADO = 200
+
+
+def formatar_brl_array(valores, prefixo: str = "R$ ") -> np.ndarray:
+    """Formata uma coluna de números como moeda BR (ex: "R$ 1.234,56") num único passo.
+
+    Valores não finitos viram texto vazio. Retorna um array de objetos (str),
+    com o mesmo texto de `formato_moeda`.
+
+    Os valores são convertidos em centavos inteiros e o número é montado
+    numa matriz de códigos de caractere de largura fixa, alinhado à direita
+    (sinal, dígitos com '.' a cada três e ",dd"). Valores muito próximos de
+    meio centavo (onde arredondar v * 100 pode diferir do arredondamento do
+    f-string) e muito grandes são formatados um a um, como em `format_brl`.
+    """
+    arr = np.asarray(valores, dtype=float).ravel()
+    n = arr.size
+    if n < _MINIMO_VETORIZADO:
+        saida = np.empty(n, dtype=object)
+        saida[:] = [prefixo + format_brl(v) if math.isfinite(v) else "" for v in arr.tolist()]
+        return saida.reshape(np.shape(valores))
+    finito = np.isfinite(arr)
+    absoluto = np.where(finito, np.abs(arr), 0.0)
+    escala = absoluto * 100.0
+    # resto (ex: 0.5000000001) perto de meio centavo: deixar o f-string decidir
+    um_a_um = finito & ((escala >= _LIMITE_CENTAVOS) | (np.abs(escala - np.floor(escala) - 0.5) < 1e-6))
+    centavos = np.rint(np.where(um_a_um, 0.0, escala)).astype(np.int64)
+    inteiro = centavos // 100
+    digitos = 1 + np.searchsorted(_POTENCIAS, inteiro, side="right")
+    negativo = np.signbit(arr) & finito
+
+    # número alinhado à direita: cada casa tem coluna fixa, só o sinal varia de posição
+    largura = int((negativo + digitos + (digitos - 1) // 3).max()) + 3
+    m = np.full((largura, n), ord(" "), dtype=np.uint32)
+    m[-1] = ord("0") + centavos % 10
+    m[-2] = ord("0") + centavos // 10 % 10
+    m[-3] = ord(",")
+    for k in range(int(digitos.max())):
+        ativo = digitos > k
+        coluna = largura - 4 - k - k // 3
+        m[coluna] = np.where(ativo, ord("0") + inteiro // (_POTENCIAS[k - 1] if k else 1) % 10, ord(" "))
+        if k and k % 3 == 0:
+            m[coluna + 1] = np.where(ativo, ord("."), m[coluna + 1])
+    linhas = np.flatnonzero(negativo)
+    m[largura - 4 - digitos[linhas] - (digitos[linhas] - 1) // 3, linhas] = ord("-")
+
+    # espaços à esquerda removidos e prefixo concatenado sem laço em Python (np.char usa os ufuncs de texto)
+    numeros = np.char.lstrip(np.ascontiguousarray(m.T).view(f"<U{largura}").ravel())
+    saida = np.char.add(prefixo, numeros).astype(object)
+    saida[~finito] = ""
+    for i in np.flatnonzero(um_a_um).tolist():
+        saida[i] = prefixo + format_brl(float(arr[i]))
+    return saida.reshape(np.shape(valores))
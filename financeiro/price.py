@@ -0,0 +1,127 @@
+"""Sistema PRICE: fator de anuidade, parcela, valor presente e tabelas de amortização.
+
+Só depende de NumPy; pandas é importado apenas pelas funções que devolvem DataFrame.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+
+COLUNAS_PRICE = ["Período", "Parcela", "Juros", "Amortização", "Saldo Devedor"]
+
+
+def fator_anuidade(rate, nper):
+    """Fator de anuidade (1 - (1+r)^-n) / r, vetorizado e com r == 0 -> n."""
+    rate, nper = np.broadcast_arrays(np.asarray(rate, dtype=float), np.asarray(nper, dtype=float))
+    fator = nper.copy()
+    nz = rate != 0
+    # expm1/log1p mantém a precisão com taxas pequenas
+    fator[nz] = -np.expm1(-nper[nz] * np.log1p(rate[nz])) / rate[nz]
+    return fator
+
+
+def parcela_price(rate, nper, pv):
+    """Parcela fixa PRICE (equivalente a -npf.pmt), aceitando escalares ou arrays."""
+    return np.asarray(pv, dtype=float) / fator_anuidade(rate, nper)
+
+
+def valor_presente_price(rate, nper, pmt):
+    """Valor presente de parcelas fixas (equivalente a -npf.pv), aceitando escalares ou arrays."""
+    return np.asarray(pmt, dtype=float) * fator_anuidade(rate, nper)
+
+
+class LotePrice(NamedTuple):
+    """Tabelas PRICE de vários empréstimos em arrays 2-D (empréstimo x período).
+
+    Linhas com prazo menor que o maior prazo do lote são completadas com NaN
+    depois do último período; `nper` guarda o prazo de cada empréstimo.
+    """
+    parcela: np.ndarray
+    juros: np.ndarray
+    amortizacao: np.ndarray
+    saldo: np.ndarray
+    nper: np.ndarray
+
+    @property
+    def periodos(self):
+        return np.arange(1, self.parcela.shape[1] + 1)
+
+    @property
+    def mascara(self):
+        """Máscara booleana dos períodos válidos de cada empréstimo."""
+        return self.periodos[None, :] <= self.nper[:, None]
+
+
+def tabela_price_lote(rates, npers, pvs):
+    """Gera as tabelas PRICE de vários empréstimos de uma só vez.
+
+    `rates`, `npers` e `pvs` são escalares ou arrays 1-D compatíveis por
+    broadcasting (prazos podem ser diferentes entre empréstimos). Usa as
+    fórmulas fechadas do sistema PRICE:
+
+        PMT   = PV * r / (1 - (1+r)^-n)
+        S_k   = PMT * (1 - (1+r)^-(n-k)) / r
+        J_k   = r * S_{k-1}
+        A_k   = PMT - J_k
+    """
+    rates, npers, pvs = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(rates, dtype=float)),
+        np.atleast_1d(np.asarray(npers)),
+        np.atleast_1d(np.asarray(pvs, dtype=float)),
+    )
+    if rates.ndim != 1:
+        raise ValueError("rates, npers e pvs devem ser escalares ou arrays 1-D")
+    if np.any(npers < 1) or np.any(npers != np.floor(npers)):
+        raise ValueError("Número de parcelas deve ser inteiro e maior que zero")
+    npers = npers.astype(np.int64)
+
+    # saldo como valor presente das parcelas restantes: fecha exatamente em zero
+    k = np.arange(0, npers.max() + 1)
+    restantes = npers[:, None] - k[None, :]
+    validos = restantes >= 0
+    fatores = fator_anuidade(rates[:, None], np.where(validos, restantes, 0))
+    pmt = pvs / fatores[:, 0]
+    saldos = np.where(validos, pmt[:, None] * fatores, np.nan)
+
+    juros = rates[:, None] * saldos[:, :-1]
+    saldo = saldos[:, 1:]
+    parcela = np.where(np.isnan(saldo), np.nan, pmt[:, None])
+    return LotePrice(parcela, juros, parcela - juros, saldo, npers)
+
+
+def tabela_price_longa(rates, npers, pvs):
+    """Tabelas PRICE de vários empréstimos em formato longo (pandas.DataFrame).
+
+    Campos: Empréstimo (posição no lote), Período, Parcela, Juros, Amortização, Saldo Devedor
+    """
+    import pandas as pd
+
+    lote = tabela_price_lote(rates, npers, pvs)
+    mascara = lote.mascara
+    emprestimo = np.broadcast_to(np.arange(len(lote.nper))[:, None], mascara.shape)
+    periodos = np.broadcast_to(lote.periodos[None, :], mascara.shape)
+    return pd.DataFrame({
+        "Empréstimo": emprestimo[mascara],
+        "Período": periodos[mascara],
+        "Parcela": lote.parcela[mascara],
+        "Juros": lote.juros[mascara],
+        "Amortização": lote.amortizacao[mascara],
+        "Saldo Devedor": lote.saldo[mascara],
+    })
+
+
+def tabela_price(rate, nper, pv):
+    """Gera uma tabela de amortização PRICE como pandas.DataFrame.
+
+    Campos: Período, Parcela, Juros, Amortização, Saldo Devedor
+    """
+    import pandas as pd
+
+    lote = tabela_price_lote(rate, nper, pv)
+    return pd.DataFrame({
+        "Período": lote.periodos,
+        "Parcela": np.abs(lote.parcela[0]),
+        "Juros": np.abs(lote.juros[0]),
+        "Amortização": np.abs(lote.amortizacao[0]),
+        "Saldo Devedor": np.abs(lote.saldo[0]),
+    })
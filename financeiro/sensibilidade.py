@@ -0,0 +1,56 @@
+"""Grade de sensibilidade da parcela PRICE sobre taxa x prazo."""
+from typing import NamedTuple
+
+import numpy as np
+
+from .price import parcela_price
+
+METRICAS = {
+    "parcela": "Parcela (R$)",
+    "juros_totais": "Juros totais (R$)",
+    "taxa_acumulada": "Taxa efetiva acumulada (%)",
+}
+
+
+class GradeSensibilidade(NamedTuple):
+    """Métricas PRICE em arrays 2-D (taxa x prazo) para um mesmo valor financiado."""
+    taxas: np.ndarray
+    prazos: np.ndarray
+    parcela: np.ndarray
+    juros_totais: np.ndarray
+    taxa_acumulada: np.ndarray
+
+    def para_longo(self):
+        """Grade em formato longo (pandas.DataFrame): Taxa (%), Prazo e uma coluna por métrica."""
+        import pandas as pd
+
+        taxas = np.repeat(self.taxas, len(self.prazos))
+        prazos = np.tile(self.prazos, len(self.taxas))
+        return pd.DataFrame({
+            "Taxa (%)": taxas * 100.0,
+            "Prazo": prazos,
+            METRICAS["parcela"]: self.parcela.ravel(),
+            METRICAS["juros_totais"]: self.juros_totais.ravel(),
+            METRICAS["taxa_acumulada"]: self.taxa_acumulada.ravel(),
+        })
+
+
+def grade_sensibilidade(taxas, prazos, pv) -> GradeSensibilidade:
+    """Calcula parcela, juros totais e taxa efetiva acumulada para cada (taxa, prazo).
+
+    `taxas` (por período, ex: 0.02) e `prazos` são arrays 1-D; o cálculo é um
+    único passo vetorizado por broadcasting, ex: 500 taxas x 360 prazos.
+    """
+    taxas = np.atleast_1d(np.asarray(taxas, dtype=float))
+    prazos = np.atleast_1d(np.asarray(prazos, dtype=np.int64))
+    if np.any(prazos < 1):
+        raise ValueError("Prazos devem ser maiores que zero")
+    if np.any(taxas <= -1):
+        raise ValueError("Taxas devem ser maiores que -100%")
+    r = taxas[:, None]
+    n = prazos[None, :]
+    parcela = parcela_price(r, n, pv)
+    juros_totais = parcela * n - pv
+    # (1+rate)**n - 1, como a "taxa efetiva acumulada" de tab_parcela
+    taxa_acumulada = np.expm1(n * np.log1p(r)) * 100.0
+    return GradeSensibilidade(taxas, prazos, parcela, juros_totais, taxa_acumulada)
@@ -0,0 +1,239 @@
+"""Simulação de Monte Carlo de pré-pagamento e inadimplência sobre a tabela PRICE.
+
+Cada empréstimo tem, a cada mês, probabilidade `pre_pagamento` de ser
+quitado antecipadamente e `inadimplencia` de entrar em default (riscos
+independentes; no mesmo mês o default tem prioridade). Os instantes dos
+eventos são sorteados diretamente de distribuições geométricas, sem laço
+sobre os meses:
+
+- pré-pagamento no mês t: a parcela t é paga junto com o saldo restante
+  (saldo do mês anterior corrigido pela taxa);
+- default no mês t: a parcela t não é paga e recupera-se
+  `recuperacao` x saldo do mês anterior, no próprio mês t;
+- sem evento: o fluxo contratual.
+
+Para cada caminho, os fluxos da carteira são somados mês a mês e daí saem a
+taxa interna de retorno realizada (mensal) e a duration de Macaulay (em
+meses) a essa taxa. Os caminhos são processados em lotes vetorizados; com
+mais de um lote, os lotes vão para um pool de processos. Cada lote recebe
+uma semente própria derivada de `np.random.SeedSequence(semente).spawn`,
+então o resultado é o mesmo com qualquer número de processos.
+
+O tamanho dos lotes depende só dos parâmetros (caminhos, empréstimos e
+prazo) e de `CELULAS_LOTE`, que é fixo: como cada lote tem sua semente,
+mudar `CELULAS_LOTE` muda os sorteios (mesma distribuição, caminhos
+diferentes), por isso ele não é configurável por variável de ambiente.
+"""
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from .price import fator_anuidade, parcela_price
+
+# células (caminho x empréstimo x mês) por lote: limita a memória de cada processo
+CELULAS_LOTE = 2_000_000
+
+_pool = None
+
+
+class ResultadoSimulacao(NamedTuple):
+    """Um valor por caminho simulado.
+
+    `taxa`: TIR mensal realizada (-1 quando nada é recebido); `duracao`:
+    duration de Macaulay em meses; `pre_pagamento` e `inadimplencia`:
+    fração dos empréstimos da carteira quitados antecipadamente / em
+    default no caminho.
+    """
+    taxa: np.ndarray
+    duracao: np.ndarray
+    pre_pagamento: np.ndarray
+    inadimplencia: np.ndarray
+
+    def para_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Taxa realizada": self.taxa,
+            "Duration (meses)": self.duracao,
+            "Pré-pagamento": self.pre_pagamento,
+            "Inadimplência": self.inadimplencia,
+        })
+
+    def percentis(self, qs=(1, 5, 25, 50, 75, 95, 99)) -> dict:
+        """Percentis de taxa e duration: {"taxa": {q: valor}, "duracao": {q: valor}}."""
+        return {
+            nome: dict(zip(qs, np.nanpercentile(valores, qs))) if np.isfinite(valores).any() else {}
+            for nome, valores in (("taxa", self.taxa), ("duracao", self.duracao))
+        }
+
+
+def _instantes(rng, probabilidade, forma, nunca):
+    """Mês do primeiro evento (1, 2, ...) com probabilidade mensal constante; `nunca` se p == 0."""
+    if probabilidade <= 0.0:
+        return np.full(forma, nunca, dtype=np.int64)
+    return np.minimum(rng.geometric(probabilidade, forma), nunca)
+
+
+def _fluxos(rates, npers, pvs, pre_pagamento, inadimplencia, recuperacao, caminhos, rng):
+    """Fluxos mensais da carteira por caminho (caminho x mês 1..T) e frações de eventos."""
+    total = int(npers.max())
+    nunca = total + 1
+    forma = (caminhos, len(npers))
+    pmt = parcela_price(rates, npers, pvs)
+
+    t_pre = _instantes(rng, pre_pagamento, forma, nunca)
+    t_def = _instantes(rng, inadimplencia, forma, nunca)
+    default = (t_def <= t_pre) & (t_def <= npers)
+    quitado = ~default & (t_pre <= npers)
+    evento = default | quitado
+    t = np.where(default, t_def, t_pre)
+    # parcelas regulares pagas: 1..t-1 com evento, 1..n sem evento
+    regulares = np.where(evento, t - 1, npers)
+
+    largura = total + 2
+    linha = np.arange(caminhos)[:, None] * largura
+    # parcelas iguais nos meses 1..regulares: +pmt no mês 1 e -pmt no mês regulares+1
+    # (vetor de diferenças, depois soma acumulada)
+    pesos = np.broadcast_to(pmt, forma).ravel()
+    diferencas = np.bincount(np.broadcast_to(linha + 1, forma).ravel(), weights=pesos, minlength=caminhos * largura)
+    diferencas -= np.bincount((linha + regulares + 1).ravel(), weights=pesos, minlength=caminhos * largura)
+    fluxos = np.cumsum(diferencas.reshape(caminhos, largura), axis=1)
+
+    # fluxo do evento no mês t, sobre o saldo do mês anterior S_(t-1) = pmt * a(r, n - t + 1)
+    linhas, colunas = np.nonzero(evento)
+    tt = t[linhas, colunas]
+    saldo = pmt[colunas] * fator_anuidade(rates[colunas], npers[colunas] - tt + 1)
+    valor = np.where(default[linhas, colunas], recuperacao * saldo, saldo * (1.0 + rates[colunas]))
+    fluxos += np.bincount(linhas * largura + tt, weights=valor, minlength=caminhos * largura).reshape(caminhos, largura)
+    return fluxos[:, 1:total + 1], quitado.mean(axis=1), default.mean(axis=1)
+
+
+def _tir(fluxos, pv, taxa_maxima, tol=1e-10, maxiter=60):
+    """TIR mensal de cada linha de `fluxos` (meses 1..T) para o investimento `pv` no mês 0.
+
+    Os fluxos são não negativos, então o valor presente é decrescente na
+    taxa e a raiz fica em (-1, taxa_maxima]: Newton protegido por esse
+    intervalo, com bisseção quando o passo sai dele (como `taxa_price_lote`).
+    """
+    meses = np.arange(1, fluxos.shape[1] + 1)
+    recebido = fluxos.sum(axis=1)
+    taxa = np.full(len(fluxos), -1.0)
+    ativos = np.flatnonzero(recebido > 0)
+    lo = np.full(ativos.size, -0.999999)
+    hi = np.full(ativos.size, taxa_maxima + 1e-9)
+    # estimativa inicial: retorno simples distribuído pelo prazo médio dos fluxos
+    prazo = (fluxos[ativos] @ meses) / recebido[ativos]
+    r = np.clip((recebido[ativos] / pv) ** (1.0 / prazo) - 1.0, lo, hi)
+
+    for _ in range(maxiter):
+        if ativos.size == 0:
+            break
+        with np.errstate(over="ignore"):
+            desconto = np.exp(np.minimum(-meses[None, :] * np.log1p(r)[:, None], 700.0))
+        ponderado = fluxos[ativos] * desconto
+        f = ponderado.sum(axis=1) - pv
+        derivada = -(ponderado @ meses) / (1.0 + r)
+
+        lo = np.where(f > 0, r, lo)
+        hi = np.where(f > 0, hi, r)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            novo = r - f / derivada
+        fora = ~np.isfinite(novo) | (novo <= lo) | (novo >= hi)
+        novo = np.where(fora, 0.5 * (lo + hi), novo)
+
+        feito = (np.abs(f) <= tol * pv) | (np.abs(novo - r) <= tol * np.maximum(1.0, np.abs(r)))
+        taxa[ativos] = np.where(np.abs(f) <= tol * pv, r, novo)
+        manter = ~feito
+        ativos, lo, hi, r = ativos[manter], lo[manter], hi[manter], novo[manter]
+    return taxa
+
+
+def _duracao(fluxos, taxa):
+    """Duration de Macaulay (meses) de cada linha à sua taxa; NaN quando nada é recebido."""
+    meses = np.arange(1, fluxos.shape[1] + 1)
+    validos = taxa > -1.0
+    duracao = np.full(len(fluxos), np.nan)
+    ponderado = fluxos[validos] * np.exp(-meses[None, :] * np.log1p(taxa[validos])[:, None])
+    duracao[validos] = (ponderado @ meses) / ponderado.sum(axis=1)
+    return duracao
+
+
+def _simular_lote(rates, npers, pvs, pre_pagamento, inadimplencia, recuperacao, caminhos, semente) -> ResultadoSimulacao:
+    rng = np.random.default_rng(semente)
+    fluxos, quitados, defaults = _fluxos(rates, npers, pvs, pre_pagamento, inadimplencia, recuperacao, caminhos, rng)
+    taxa = _tir(fluxos, float(pvs.sum()), float(rates.max()))
+    return ResultadoSimulacao(taxa, _duracao(fluxos, taxa), quitados, defaults)
+
+
+def _obter_pool(processos):
+    # "spawn": o pool pode ser criado dentro do servidor do Streamlit, que tem várias
+    # threads, e fork copiaria locks em qualquer estado
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=processos or os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+        atexit.register(fechar_pool)
+    return _pool
+
+
+def fechar_pool():
+    """Encerra o pool de processos (se houver); o próximo lote grande cria outro."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False)
+        _pool = None
+
+
+def simular_carteira(
+    rates, npers, pvs, pre_pagamento, inadimplencia, recuperacao=0.0,
+    caminhos=10_000, semente=0, processos=None,
+) -> ResultadoSimulacao:
+    """Simula `caminhos` cenários da carteira (arrays 1-D de taxa mensal, prazo e valor).
+
+    `pre_pagamento` e `inadimplencia` são probabilidades mensais (ex: 0.01
+    = 1% ao mês); `recuperacao` é a fração do saldo recuperada no default.
+    Os mesmos parâmetros e `semente` dão sempre o mesmo resultado, com
+    qualquer número de processos. `processos` só vale na criação do pool
+    (compartilhado pelo processo e encerrado na saída).
+    """
+    rates, npers, pvs = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(rates, dtype=float)),
+        np.atleast_1d(np.asarray(npers)),
+        np.atleast_1d(np.asarray(pvs, dtype=float)),
+    )
+    if rates.ndim != 1:
+        raise ValueError("rates, npers e pvs devem ser escalares ou arrays 1-D")
+    if np.any(npers < 1) or np.any(npers != np.floor(npers)):
+        raise ValueError("Número de parcelas deve ser inteiro e maior que zero")
+    if np.any(pvs <= 0) or np.any(rates < 0):
+        raise ValueError("Valores financiados devem ser positivos e taxas não negativas")
+    for nome, p in (("pré-pagamento", pre_pagamento), ("inadimplência", inadimplencia), ("recuperação", recuperacao)):
+        if not 0.0 <= p <= 1.0:
+            raise ValueError(f"Probabilidade de {nome} deve estar entre 0 e 1")
+    if caminhos < 1:
+        raise ValueError("Número de caminhos deve ser maior que zero")
+    npers = npers.astype(np.int64)
+
+    por_lote = max(1, CELULAS_LOTE // (len(npers) * int(npers.max())))
+    tamanhos = [min(por_lote, caminhos - i) for i in range(0, caminhos, por_lote)]
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    argumentos = (rates, npers, pvs, float(pre_pagamento), float(inadimplencia), float(recuperacao))
+    if len(tamanhos) == 1:
+        partes = [_simular_lote(*argumentos, tamanhos[0], sementes[0])]
+    else:
+        pool = _obter_pool(processos)
+        partes = list(pool.map(_simular_lote, *zip(*[argumentos + (n, s) for n, s in zip(tamanhos, sementes)])))
+    return ResultadoSimulacao(*(np.concatenate(coluna) for coluna in zip(*partes)))
+
+
+def simular_emprestimo(rate, nper, pv, pre_pagamento, inadimplencia, recuperacao=0.0, caminhos=10_000, semente=0, processos=None):
+    """`simular_carteira` para um único empréstimo."""
+    return simular_carteira(rate, nper, pv, pre_pagamento, inadimplencia, recuperacao, caminhos, semente, processos)
+
+
+def probabilidade_mensal(anual):
+    """Converte uma taxa anual de eventos (CPR/CDR, ex: 0.12) na probabilidade mensal equivalente."""
+    return 1.0 - (1.0 - anual) ** (1.0 / 12.0)
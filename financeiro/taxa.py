@@ -0,0 +1,143 @@
+"""Cálculo da taxa por período de anuidades PRICE (substitui npf.rate)."""
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+
+class ResultadoTaxa(NamedTuple):
+    """Resultado de `taxa_price_lote`: taxa por período, iterações e convergência por elemento."""
+    taxa: np.ndarray
+    iteracoes: np.ndarray
+    convergiu: np.ndarray
+
+
+def _anuidade_e_derivada(rate, nper):
+    """Fator de anuidade a(r, n) e sua derivada da/dr, estáveis perto de r = 0."""
+    pequena = np.abs(rate) < 1e-6
+    r = np.where(pequena, 1.0, rate)
+    v_n = np.exp(-nper * np.log1p(r))
+    fator = (1.0 - v_n) / r
+    derivada = (nper * v_n / (1.0 + r) - fator) / r
+    # série de Taylor em torno de r = 0
+    c1 = nper * (nper + 1) / 2.0
+    c2 = nper * (nper + 1) * (nper + 2) / 6.0
+    fator = np.where(pequena, nper - c1 * rate + c2 * rate ** 2, fator)
+    derivada = np.where(pequena, -c1 + 2.0 * c2 * rate, derivada)
+    return fator, derivada
+
+
+def _anuidade_e_derivada_escalar(rate, nper):
+    """`_anuidade_e_derivada` para um único valor, em Python puro."""
+    if abs(rate) < 1e-6:
+        c1 = nper * (nper + 1) / 2.0
+        c2 = nper * (nper + 1) * (nper + 2) / 6.0
+        return nper - c1 * rate + c2 * rate * rate, -c1 + 2.0 * c2 * rate
+    v_n = math.exp(-nper * math.log1p(rate))
+    fator = (1.0 - v_n) / rate
+    return fator, (nper * v_n / (1.0 + rate) - fator) / rate
+
+
+def taxa_price_lote(nper, pmt, pv, tol=1e-12, maxiter=100):
+    """Encontra a taxa por período de anuidades PRICE (substitui npf.rate), vetorizado.
+
+    Resolve pmt * (1 - (1+r)^-n) / r = pv para cada elemento de (nper, pmt, pv),
+    com pmt e pv positivos. Parte de uma estimativa analítica (expansão de
+    primeira ordem em r = 0) e aplica Newton protegido por um intervalo que
+    sempre contém a raiz:
+
+        (pmt/pv)^(1/n) - 1  <=  r  <=  pmt/pv
+
+    Quando o passo de Newton sai do intervalo é feita uma bisseção. Entradas
+    inválidas (pmt ou pv não positivos, n < 1) ou que não convergem em
+    `maxiter` iterações ficam com `convergiu == False` e taxa NaN.
+    """
+    nper, pmt, pv = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(nper, dtype=float)),
+        np.atleast_1d(np.asarray(pmt, dtype=float)),
+        np.atleast_1d(np.asarray(pv, dtype=float)),
+    )
+    taxa = np.full(nper.shape, np.nan)
+    iteracoes = np.zeros(nper.shape, dtype=np.int64)
+    convergiu = np.zeros(nper.shape, dtype=bool)
+
+    validos = (nper >= 1) & (pmt > 0) & (pv > 0) & np.isfinite(pmt) & np.isfinite(pv)
+    idx = np.flatnonzero(validos)
+    if idx.size == 0:
+        return ResultadoTaxa(taxa, iteracoes, convergiu)
+    n, p, v = nper.ravel()[idx], pmt.ravel()[idx], pv.ravel()[idx]
+
+    lo = (p / v) ** (1.0 / n) - 1.0
+    hi = p / v
+    r = np.clip(2.0 * (n * p - v) / (p * n * (n + 1.0)), lo, hi)
+    feito = np.zeros(idx.size, dtype=bool)
+    its = np.zeros(idx.size, dtype=np.int64)
+
+    for _ in range(maxiter):
+        ativos = np.flatnonzero(~feito)
+        if ativos.size == 0:
+            break
+        ra, na = r[ativos], n[ativos]
+        fator, derivada = _anuidade_e_derivada(ra, na)
+        f = p[ativos] * fator - v[ativos]
+        its[ativos] += 1
+
+        # f é decrescente em r: atualizar o intervalo que contém a raiz
+        lo[ativos] = np.where(f > 0, ra, lo[ativos])
+        hi[ativos] = np.where(f > 0, hi[ativos], ra)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            novo = ra - f / (p[ativos] * derivada)
+        fora = ~np.isfinite(novo) | (novo <= lo[ativos]) | (novo >= hi[ativos])
+        novo = np.where(fora, 0.5 * (lo[ativos] + hi[ativos]), novo)
+
+        ok_f = np.abs(f) <= tol * v[ativos]
+        ok_passo = np.abs(novo - ra) <= tol * np.maximum(1.0, np.abs(ra))
+        r[ativos] = np.where(ok_f, ra, novo)
+        feito[ativos] = ok_f | ok_passo
+
+    taxa.ravel()[idx] = np.where(feito, r, np.nan)
+    iteracoes.ravel()[idx] = its
+    convergiu.ravel()[idx] = feito
+    return ResultadoTaxa(taxa, iteracoes, convergiu)
+
+
+def _taxa_escalar(n, p, v, tol=1e-12, maxiter=100):
+    # mesma iteração de `taxa_price_lote` para um único empréstimo, sem o overhead do NumPy
+    if not (n >= 1 and 0 < p < math.inf and 0 < v < math.inf):
+        return None
+    lo = (p / v) ** (1.0 / n) - 1.0
+    hi = p / v
+    r = min(max(2.0 * (n * p - v) / (p * n * (n + 1.0)), lo), hi)
+    for _ in range(maxiter):
+        fator, derivada = _anuidade_e_derivada_escalar(r, n)
+        f = p * fator - v
+        if f > 0:
+            lo = r
+        else:
+            hi = r
+        novo = r - f / (p * derivada) if derivada != 0 else math.nan
+        if not (lo < novo < hi):
+            novo = 0.5 * (lo + hi)
+        if abs(f) <= tol * v:
+            return r
+        if abs(novo - r) <= tol * max(1.0, abs(r)):
+            return novo
+        r = novo
+    return None
+
+
+def taxa_price(nper, pmt, pv):
+    """Taxa por período de um único empréstimo PRICE; lança ValueError se não houver solução.
+
+    Escalares são resolvidos em Python puro (com um único valor, o custo de
+    `taxa_price_lote` é quase todo overhead do NumPy).
+    """
+    if np.ndim(nper) == np.ndim(pmt) == np.ndim(pv) == 0:
+        taxa = _taxa_escalar(float(nper), float(pmt), float(pv))
+    else:
+        resultado = taxa_price_lote(nper, pmt, pv)
+        taxa = float(resultado.taxa[0]) if resultado.convergiu[0] else None
+    if taxa is None:
+        raise ValueError("Não há taxa que produza essa parcela para o valor financiado informado")
+    return taxa
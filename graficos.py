@@ -0,0 +1,86 @@
+"""Gráficos da tabela PRICE (saldo devedor e composição juros x amortização).
+
+Acima de `LIMITE_PONTOS` períodos as séries são reduzidas com LTTB antes de
+montar o gráfico, o formato longo da composição é montado direto dos arrays
+(sem `df.melt`) e a especificação Vega-Lite serializada fica em cache, para
+que entradas repetidas não reconstruam nem reserializem o gráfico.
+"""
+import os
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from financeiro.amostragem import lttb
+from financeiro.memo import CacheLRU, tabela_price_cache
+
+LIMITE_PONTOS = int(os.environ.get("PRICE_GRAFICO_LIMITE", "120"))
+
+_cache = CacheLRU(int(os.environ.get("PRICE_CACHE_TAMANHO", "256")))
+
+
+def _eixo_periodo(reduzido):
+    # com pontos descartados o eixo precisa ser quantitativo para manter o espaçamento
+    return alt.X('Período:Q' if reduzido else 'Período:O', title='Período')
+
+
+def spec_saldo(periodos, saldo, limite=LIMITE_PONTOS) -> dict:
+    """Especificação Vega-Lite do gráfico de saldo devedor."""
+    idx = lttb(periodos, saldo, limite)
+    reduzido = len(idx) < len(periodos)
+    dados = pd.DataFrame({"Período": np.asarray(periodos)[idx], "Saldo Devedor": np.asarray(saldo)[idx]})
+    chart = alt.Chart(dados).mark_line(point=not reduzido).encode(x=_eixo_periodo(reduzido), y=alt.Y('Saldo Devedor:Q'))
+    return chart.to_dict()
+
+
+def spec_composicao(periodos, juros, amortizacao, limite=LIMITE_PONTOS) -> dict:
+    """Especificação Vega-Lite da área empilhada juros x amortização."""
+    # as duas séries precisam dos mesmos períodos para empilhar; juros é a curva mais curva
+    idx = lttb(periodos, juros, limite)
+    reduzido = len(idx) < len(periodos)
+    k = len(idx)
+    periodos_sel = np.asarray(periodos)[idx]
+    # formato longo montado direto: [juros..., amortização...]
+    dados = pd.DataFrame({
+        "Período": np.concatenate([periodos_sel, periodos_sel]),
+        "Tipo": np.repeat(np.array(["Juros", "Amortização"], dtype=object), k),
+        "Valor": np.concatenate([np.asarray(juros)[idx], np.asarray(amortizacao)[idx]]),
+    })
+    chart = alt.Chart(dados).mark_area(opacity=0.6).encode(
+        x=_eixo_periodo(reduzido), y=alt.Y('Valor:Q', stack='zero'),
+        color=alt.Color('Tipo:N', scale=alt.Scale(domain=['Juros', 'Amortização'], range=['#d62728', '#1f77b4']))
+    )
+    return chart.to_dict()
+
+
+def specs_tabela(df, limite=LIMITE_PONTOS):
+    """(spec_saldo, spec_composicao) de uma tabela PRICE já calculada (sem cache)."""
+    periodos = df["Período"].to_numpy()
+    return (
+        spec_saldo(periodos, df["Saldo Devedor"].to_numpy(), limite),
+        spec_composicao(periodos, df["Juros"].to_numpy(), df["Amortização"].to_numpy(), limite),
+    )
+
+
+def specs_price(rate, nper, pv, limite=LIMITE_PONTOS):
+    """(spec_saldo, spec_composicao) da tabela PRICE, com cache por (rate, nper, pv, limite)."""
+    return _cache.obter((float(rate), int(nper), float(pv), int(limite)), lambda: specs_tabela(tabela_price_cache(rate, nper, pv), limite))
+
+
+def exibir_specs(saldo, composicao):
+    """Desenha as especificações devolvidas por `specs_price`/`specs_tabela`."""
+    st.subheader("Saldo Devedor")
+    st.vega_lite_chart(saldo, use_container_width=True)
+    st.subheader("Composição: Juros x Amortização")
+    st.vega_lite_chart(composicao, use_container_width=True)
+
+
+def estatisticas() -> dict:
+    """Contadores do cache de especificações (compartilhado entre as sessões)."""
+    return _cache.estatisticas()
+
+
+def valores_em_cache() -> list:
+    """Especificações guardadas no cache (são de todas as sessões)."""
+    return _cache.valores()
@@ -1,83 +1,26 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import numpy_financial as npf
-
-
-def formato_moeda(x):
-    """Formata número como moeda BR (R$) usando vírgula como separador decimal.
-
-    Retorna o próprio valor se não for numérico.
-    """
-    return f"R$ {x:,.2f}".replace(".", ",") if isinstance(x, (int, float, np.floating, np.integer)) else x
-
+from typing import Optional
 
-def tabela_price(rate, nper, pv):
-    """Gera uma tabela de amortização PRICE como pandas.DataFrame.
+import streamlit as st
 
-    Campos: Período, Parcela, Juros, Amortização, Saldo Devedor
-    """
-    parcelas = []
-    saldo = pv
-    pmt = -npf.pmt(rate, nper, pv) if rate != 0 else pv / nper
-    for periodo in range(1, nper + 1):
-        juros = npf.ipmt(rate, periodo, nper, pv) if rate != 0 else 0.0
-        amort = npf.ppmt(rate, periodo, nper, pv) if rate != 0 else -pmt
-        saldo = saldo + amort
-        parcelas.append({
-            "Período": periodo,
-            "Parcela": float(abs(pmt)),
-            "Juros": float(abs(juros)),
-            "Amortização": float(abs(amort)),
-            "Saldo Devedor": float(abs(saldo)),
-        })
-    return pd.DataFrame(parcelas)
-
-
-def _parse_number(value):
-    """Tenta parsear uma entrada que pode conter vírgula como separador decimal."""
-    if value is None:
-        return None
-    if isinstance(value, (int, float, np.floating, np.integer)):
-        return float(value)
-    # remover espaços e trocar vírgula por ponto
-    try:
-        s = str(value).strip().replace('.', '').replace(',', '.')
-        return float(s)
-    except Exception:
-        return None
-
-
-
-def _format_brl(value: float) -> str:
-    # formata com separador de milhares '.' e decimal ',' (ex: 1.234,56)
-    s = f"{value:,.2f}"
-    # f-string usa ',' como separador de milhares e '.' como decimal -> trocar
-    s = s.replace(',', 'X').replace('.', ',').replace('X', '.')
-    return s
-
-
-def _parse_number_string(s: str) -> float:
-    if s is None:
-        raise ValueError("Valor vazio")
-    s = str(s).strip()
-    if s == "":
-        raise ValueError("Valor vazio")
-    # remover R$ se presente
-    s = s.replace('R$', '').strip()
-    # se contém vírgula, assumir formato BR: milhares com '.' e decimal com ','
-    if ',' in s:
-        # remover pontos de milhares
-        s = s.replace('.', '')
-        # trocar vírgula por ponto decimal
-        s = s.replace(',', '.')
-    # caso contrário, assume-se ponto como decimal
-    # remover espaços
-    s = s.replace(' ', '')
-    try:
-        return float(s)
-    except Exception:
-        raise ValueError(f"Não foi possível interpretar '{s}' como número")
+# Os cálculos ficam no pacote `financeiro` (sem dependência do Streamlit);
+# os nomes abaixo são reexportados para manter compatibilidade.
+from financeiro.numeros import (
+    formatar_brl_array,
+    formato_moeda,
+    parse_number as _parse_number,
+    format_brl as _format_brl,
+    parse_number_string as _parse_number_string,
+)
+from financeiro.price import (
+    COLUNAS_PRICE,
+    LotePrice,
+    parcela_price,
+    valor_presente_price,
+    tabela_price,
+    tabela_price_lote,
+    tabela_price_longa,
+)
+from financeiro.taxa import ResultadoTaxa, taxa_price, taxa_price_lote
 
 
 def money_input(label: str, key: str, value: float = 0.0, help: str = None, disabled: bool = False):
@@ -105,3 +48,140 @@ def percent_input(label: str, key: str, value: float = 0.0, help: str = None, di
     except ValueError:
         parsed = None
     return parsed
+
+
+def preservar_estado(prefixos):
+    """Mantém os valores dos widgets cujas keys começam com `prefixos`.
+
+    O Streamlit descarta o estado de um widget que deixa de ser desenhado em
+    uma execução; regravar a key na session_state a transforma em estado
+    comum, que sobrevive até o widget voltar a ser desenhado. Usado para as
+    calculadoras que não estão selecionadas.
+    """
+    prefixos = tuple(prefixos)
+    for chave in list(st.session_state.keys()):
+        if chave.startswith(prefixos):
+            st.session_state[chave] = st.session_state[chave]
+
+
+COLUNAS_MOEDA = ["Parcela", "Juros", "Amortização", "Saldo Devedor"]
+
+
+def tabela_paginada(df, key: str, linhas_por_pagina: Optional[int] = 24, colunas_moeda=COLUNAS_MOEDA):
+    """Mostra a tabela PRICE enviando ao navegador só a página visível.
+
+    `df` fica com as colunas numéricas originais; a formatação em R$ é
+    aplicada apenas às linhas exibidas (na grade, às do intervalo
+    filtrado). Para tabelas maiores que uma página há filtro por intervalo
+    de períodos, seleção de página e a opção de uma grade virtualizada
+    (st.dataframe), que só desenha as linhas visíveis.
+    Com `linhas_por_pagina=None` a tabela inteira é mostrada, sem controles.
+    `colunas_moeda` são as colunas exibidas em R$ (padrão: as da tabela PRICE).
+    """
+    n = len(df)
+    if linhas_por_pagina is not None and n > linhas_por_pagina:
+        c1, c2 = st.columns([3, 1])
+        ini, fim = c1.slider("Períodos", 1, n, (1, n), key=f"{key}_periodos")
+        modo = c2.radio("Exibição", ["Páginas", "Grade"], key=f"{key}_modo", horizontal=True)
+        df = df.iloc[ini - 1:fim]
+        if modo == "Grade":
+            # mesmo texto em R$ das páginas (o formato do st.column_config não tem separadores BR)
+            st.dataframe(_formatar_moeda(df, colunas_moeda), hide_index=True, use_container_width=True)
+            return
+        paginas = max(1, -(-len(df) // linhas_por_pagina))
+        chave_pagina = f"{key}_pagina"
+        # o intervalo pode ter encolhido: manter a página dentro do novo limite
+        if st.session_state.get(chave_pagina, 1) > paginas:
+            st.session_state[chave_pagina] = paginas
+        pagina = int(c2.number_input("Página", min_value=1, max_value=paginas, step=1, key=chave_pagina))
+        df = df.iloc[(pagina - 1) * linhas_por_pagina:pagina * linhas_por_pagina]
+        st.caption(f"Períodos {ini + (pagina - 1) * linhas_por_pagina} a {ini - 1 + (pagina - 1) * linhas_por_pagina + len(df)} de {n} — página {pagina} de {paginas}")
+
+    st.table(_formatar_moeda(df, colunas_moeda).reset_index(drop=True))
+
+
+def _formatar_moeda(df, colunas_moeda):
+    """Cópia de `df` com `colunas_moeda` como texto em R$ (ex: "R$ 1.234,56")."""
+    from financeiro.instrumentacao import fase
+
+    with fase("formatacao"):
+        saida = df.copy()
+        for c in colunas_moeda:
+            saida[c] = formatar_brl_array(df[c].to_numpy())
+    return saida
+
+
+def _tamanho(obj, ignorar, vistos):
+    """Bytes aproximados de `obj` e do que ele referencia (arrays, DataFrames, containers, atributos)."""
+    import sys
+
+    import numpy as np
+
+    if id(obj) in vistos or id(obj) in ignorar or callable(obj):
+        return 0
+    vistos.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    if hasattr(obj, "memory_usage") and hasattr(obj, "columns"):  # DataFrame
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    total = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        filhos = [x for par in obj.items() for x in par]
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        filhos = list(obj)
+    elif isinstance(obj, (str, bytes, bytearray, int, float, complex)) or obj is None:
+        filhos = []
+    else:
+        filhos = list(getattr(obj, "__dict__", {}).values())
+        filhos += [getattr(obj, nome) for nome in getattr(type(obj), "__slots__", ()) if hasattr(obj, nome)]
+    return total + sum(_tamanho(f, ignorar, vistos) for f in filhos)
+
+
+def tamanho_estado():
+    """(número de keys, bytes aproximados) da session_state desta sessão.
+
+    Objetos que também estão nos caches compartilhados de `financeiro.memo`
+    e de `graficos` (ex: tabelas e gráficos referenciados pelo grafo
+    incremental) não entram na conta.
+    """
+    import graficos
+    from financeiro import memo
+
+    compartilhados = set()
+    _tamanho(memo.valores_em_cache() + graficos.valores_em_cache(), set(), compartilhados)
+    vistos = set()
+    valores = [st.session_state[k] for k in list(st.session_state.keys())]
+    return len(valores), sum(_tamanho(v, compartilhados, vistos) for v in valores)
+
+
+def painel_instrumentacao():
+    """Painel de depuração com o tempo de cada fase das abas (só quando a instrumentação está ativa)."""
+    import json
+
+    import pandas as pd
+
+    import graficos
+    from financeiro import instrumentacao, memo
+
+    if not instrumentacao.ativa():
+        return
+    with st.expander("Desempenho (debug)"):
+        ultimas = instrumentacao.ultimas_medicoes()
+        if ultimas:
+            atual = ultimas[-1]
+            st.caption(f"Última execução: aba '{atual.aba}' em {atual.total * 1000:.1f} ms")
+            st.table(pd.DataFrame(
+                {"Fase": list(atual.fases), "Tempo (ms)": [s * 1000 for s in atual.fases.values()]}
+            ))
+        resumo = instrumentacao.resumo()
+        if resumo:
+            st.caption("Acumulado desde o início do servidor")
+            st.dataframe(pd.DataFrame(resumo))
+        st.caption(f"Cache de tabelas: {memo.estatisticas()}")
+        st.caption(f"Cache de gráficos: {graficos.estatisticas()}")
+        st.caption(f"Cache de simulações: {memo.estatisticas_simulacao()}")
+        keys, tamanho = tamanho_estado()
+        st.caption(f"Estado da sessão: {keys} keys, ~{tamanho} bytes")
+        st.code(instrumentacao.exportar_prometheus(), language="text")
+        linhas = "\n".join(json.dumps(m.como_dict(), ensure_ascii=False) for m in ultimas)
+        st.download_button("Baixar medições (JSON lines)", linhas.encode("utf-8"), file_name="medicoes.jsonl", mime="application/json")
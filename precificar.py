@@ -0,0 +1,88 @@
+"""Precificação em lote de cenários a partir de um arquivo CSV.
+
+Generaliza o cenário fixo de `juros.py`: cada linha do arquivo de entrada
+informa valor_total, entrada, parcelas e o valor da parcela (a taxa é
+inferida) ou a taxa mensal em % (a parcela é calculada). O arquivo é lido em
+blocos, processados em paralelo num pool de processos, e o resultado é
+gravado em CSV na mesma ordem da entrada.
+
+Exemplo:
+
+    python precificar.py cenarios.csv resultado.csv --bloco 50000 --processos 4
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from financeiro.cenarios import precificar_cenarios
+
+
+def _ler_blocos(caminho, tamanho_bloco, sep, decimal):
+    return pd.read_csv(caminho, sep=sep, decimal=decimal, chunksize=tamanho_bloco)
+
+
+def _progresso(linhas, inicio, arquivo=sys.stderr):
+    decorrido = max(time.perf_counter() - inicio, 1e-9)
+    print(f"\r{linhas:,} linhas processadas — {linhas / decorrido:,.0f} linhas/s", end="", file=arquivo, flush=True)
+
+
+def precificar_arquivo(entrada, saida, tamanho_bloco=50_000, processos=None, sep=",", decimal=".", progresso=True):
+    """Lê `entrada` em blocos, precifica em paralelo e grava `saida` em CSV.
+
+    Mantém no máximo 2 blocos por processo em andamento, para que a memória
+    não cresça com o tamanho do arquivo. Retorna o número de linhas gravadas.
+    """
+    processos = processos or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    linhas = 0
+    primeiro = True
+    with ProcessPoolExecutor(max_workers=processos) as pool, open(saida, "w", encoding="utf-8", newline="") as arquivo:
+        pendentes = deque()
+
+        def gravar_proximo():
+            nonlocal linhas, primeiro
+            resultado = pendentes.popleft().result()
+            resultado.to_csv(arquivo, header=primeiro, index=False, lineterminator="\n")
+            primeiro = False
+            linhas += len(resultado)
+            if progresso:
+                _progresso(linhas, inicio)
+
+        for bloco in _ler_blocos(entrada, tamanho_bloco, sep, decimal):
+            pendentes.append(pool.submit(precificar_cenarios, bloco))
+            if len(pendentes) >= 2 * processos:
+                gravar_proximo()
+        while pendentes:
+            gravar_proximo()
+    if progresso:
+        print(file=sys.stderr)
+    return linhas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precifica cenários PRICE em lote (taxa ou parcela).")
+    parser.add_argument("entrada", help="CSV com valor_total, entrada, parcelas e parcela ou taxa (% ao mês)")
+    parser.add_argument("saida", help="CSV de saída")
+    parser.add_argument("--bloco", type=int, default=50_000, help="linhas por bloco (padrão: 50000)")
+    parser.add_argument("--processos", type=int, default=None, help="número de processos (padrão: nº de CPUs)")
+    parser.add_argument("--sep", default=",", help="separador de colunas (padrão: ',')")
+    parser.add_argument("--decimal", default=".", help="separador decimal (padrão: '.')")
+    parser.add_argument("--silencioso", action="store_true", help="não mostrar o progresso")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    linhas = precificar_arquivo(
+        args.entrada, args.saida, args.bloco, args.processos, args.sep, args.decimal, progresso=not args.silencioso
+    )
+    decorrido = time.perf_counter() - inicio
+    print(f"{linhas:,} cenários em {decorrido:.2f}s ({linhas / max(decorrido, 1e-9):,.0f} linhas/s) -> {args.saida}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Saída comum das abas: tabela PRICE -> tabela paginada -> gráficos -> CSV.
+
+Todas as calculadoras terminam com a mesma tabela de amortização; cada uma
+só descobre (rate, nper, pv) e chama `exibir_resultado_price`. Tabela, CSV
+e gráficos vêm de caches compartilhados entre as sessões, por (rate, nper,
+pv); o grafo incremental por aba e por sessão (ver `financeiro.incremental`)
+só guarda referências a eles e evita repetir as consultas quando nada
+mudou. As fases de exibição são medidas só aqui.
+"""
+import streamlit as st
+
+from financeiro.incremental import grafo_price
+from financeiro.instrumentacao import fase
+from graficos import exibir_specs, specs_price
+from helpers import tabela_paginada
+
+
+def _grafo_sessao(aba):
+    chave = f"{aba}_incremental"
+    if chave not in st.session_state:
+        st.session_state[chave] = grafo_price().no("graficos", ("rate", "nper", "pv"), specs_price)
+    return st.session_state[chave]
+
+
+def exibir_resultado_price(rate, nper, pv, aba, nome_arquivo):
+    """Mostra tabela de amortização, gráficos e botão de download do CSV.
+
+    `aba` separa o estado de sessão (grafo e widgets de paginação) de cada
+    calculadora. Mudar só o PV reescala a tabela já calculada; mudar só a
+    paginação não recalcula nada.
+    """
+    grafo = _grafo_sessao(aba).definir(rate=float(rate), nper=int(nper), pv=float(pv))
+    with fase("exibicao"):
+        st.subheader("Tabela de Amortização (PRICE)")
+        tabela_paginada(grafo.obter("tabela"), key=f"{aba}_tabela")
+
+    with fase("graficos"):
+        exibir_specs(*grafo.obter("graficos"))
+
+    with fase("download"):
+        st.download_button("Baixar tabela (CSV)", grafo.obter("csv"), file_name=nome_arquivo, mime='text/csv')
@@ -0,0 +1,214 @@
+"""Serviço HTTP (asyncio, só biblioteca padrão) para cotar parcela, taxa e PV.
+
+Endpoints (JSON, campos como em `financeiro.cotacao`):
+
+- POST /parcela, /taxa, /pv: um item no corpo, um resultado na resposta;
+- POST /lote: {"operacao": "parcela" | "taxa" | "pv", "itens": [...]};
+- GET /saude: estado do serviço e contadores do cache.
+
+Respostas de /parcela, /taxa e /pv ficam num cache LRU pelo corpo
+normalizado; as de /lote, num cache menor à parte (`--cache-lote`), já que
+cada uma pode ter milhares de itens. Lotes grandes são calculados num pool
+de processos para não bloquear o laço de eventos; lotes pequenos são
+calculados no próprio laço (a versão vetorizada leva microssegundos).
+
+Exemplo:
+
+    python servico.py --porta 8000 --processos 4
+    curl -d '{"valor_total": 3519, "entrada": 1000, "parcelas": 5, "taxa": 4.0692}' localhost:8000/parcela
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from financeiro.cotacao import OPERACOES, cotar
+from financeiro.memo import CacheLRU
+
+# acima disso o lote vai para o pool de processos
+LIMITE_LOTE_LOCAL = int(os.environ.get("PRICE_SERVICO_LOTE_LOCAL", "2000"))
+MAX_CORPO = int(os.environ.get("PRICE_SERVICO_MAX_CORPO", str(16 * 1024 * 1024)))
+
+_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ErroHTTP(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def _json(dados) -> bytes:
+    return json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ServicoPrice:
+    """Roteamento e cálculo; o transporte HTTP fica em `_atender`."""
+
+    def __init__(self, processos=None, tamanho_cache=4096, tamanho_cache_lote=64):
+        self.processos = processos
+        self.cache = CacheLRU(tamanho_cache)
+        self.cache_lote = CacheLRU(tamanho_cache_lote)
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processos or os.cpu_count() or 1)
+        return self._pool
+
+    def fechar(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    async def tratar(self, metodo, caminho, corpo: bytes):
+        """Devolve (status, corpo da resposta em bytes)."""
+        caminho = caminho.split("?", 1)[0].rstrip("/") or "/"
+        if caminho == "/saude":
+            if metodo != "GET":
+                raise ErroHTTP(405, "Use GET")
+            return 200, _json({"status": "ok", "cache": self.cache.estatisticas(), "cache_lote": self.cache_lote.estatisticas()})
+        operacao = caminho.lstrip("/")
+        if operacao not in OPERACOES and operacao != "lote":
+            raise ErroHTTP(404, f"Caminho desconhecido: {caminho}")
+        if metodo != "POST":
+            raise ErroHTTP(405, "Use POST")
+        try:
+            dados = json.loads(corpo or b"null")
+        except ValueError:
+            raise ErroHTTP(400, "Corpo não é um JSON válido") from None
+
+        if operacao == "lote":
+            if not isinstance(dados, dict) or not isinstance(dados.get("itens"), list):
+                raise ErroHTTP(400, "Envie {\"operacao\": ..., \"itens\": [...]}")
+            itens = dados["itens"]
+            if not all(isinstance(item, dict) for item in itens):
+                raise ErroHTTP(400, "Cada item do lote deve ser um objeto JSON")
+            # resumo do corpo normalizado: a chave não guarda o lote inteiro
+            chave = hashlib.sha1(json.dumps(dados, sort_keys=True).encode("utf-8")).digest()
+            resposta = self.cache_lote.consultar(chave)
+            if resposta is None:
+                resposta = _json({"resultados": await self._cotar(dados.get("operacao"), itens)})
+                self.cache_lote.guardar(chave, resposta)
+            return 200, resposta
+
+        if not isinstance(dados, dict):
+            raise ErroHTTP(400, "Envie um objeto JSON")
+        chave = (operacao, json.dumps(dados, sort_keys=True))
+        # cálculo de um item é barato: pode rodar dentro do cache, no próprio laço
+        return 200, self.cache.obter(chave, lambda: self._resposta_item(operacao, dados))
+
+    @staticmethod
+    def _resposta_item(operacao, dados) -> bytes:
+        try:
+            (resultado,) = cotar(operacao, [dados])
+        except ValueError as e:
+            mensagem = str(e)
+            raise ErroHTTP(400, mensagem[len("Item 0: "):] if mensagem.startswith("Item 0: ") else mensagem) from None
+        if "erro" in resultado:
+            raise ErroHTTP(400, resultado["erro"])
+        return _json(resultado)
+
+    async def _cotar(self, operacao, itens):
+        try:
+            if len(itens) <= LIMITE_LOTE_LOCAL:
+                return cotar(operacao, itens)
+            return await asyncio.get_running_loop().run_in_executor(self.pool, cotar, operacao, itens)
+        except ValueError as e:
+            raise ErroHTTP(400, str(e)) from None
+
+
+async def _ler_requisicao(leitor):
+    linha = await leitor.readline()
+    if not linha:
+        return None
+    try:
+        metodo, caminho, versao = linha.decode("latin-1").split()
+    except ValueError:
+        raise ErroHTTP(400, "Linha de requisição inválida") from None
+    cabecalhos = {}
+    while True:
+        linha = await leitor.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        cabecalhos[nome.strip().lower()] = valor.strip()
+    tamanho = cabecalhos.get("content-length") or "0"
+    if not tamanho.isdigit():
+        raise ErroHTTP(400, "Content-Length inválido")
+    tamanho = int(tamanho)
+    if tamanho > MAX_CORPO:
+        raise ErroHTTP(413, f"Corpo maior que {MAX_CORPO} bytes")
+    corpo = await leitor.readexactly(tamanho) if tamanho else b""
+    manter = cabecalhos.get("connection", "").lower() != "close" and versao == "HTTP/1.1"
+    return metodo.upper(), caminho, corpo, manter
+
+
+def _resposta(status, corpo: bytes, manter: bool) -> bytes:
+    cabecalho = (
+        f"HTTP/1.1 {status} {_STATUS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(corpo)}\r\n"
+        f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n"
+    )
+    return cabecalho.encode("latin-1") + corpo
+
+
+async def _atender(servico, leitor, escritor):
+    try:
+        while True:
+            manter = False
+            try:
+                requisicao = await _ler_requisicao(leitor)
+                if requisicao is None:
+                    break
+                metodo, caminho, corpo, manter = requisicao
+                status, saida = await servico.tratar(metodo, caminho, corpo)
+            except ErroHTTP as e:
+                status, saida = e.status, _json({"erro": str(e)})
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as e:  # não derrubar a conexão por um erro inesperado
+                status, saida = 500, _json({"erro": f"Erro interno: {e}"})
+            escritor.write(_resposta(status, saida, manter))
+            await escritor.drain()
+            if not manter:
+                break
+    finally:
+        escritor.close()
+
+
+async def servir(host="127.0.0.1", porta=8000, processos=None, tamanho_cache=4096, tamanho_cache_lote=64):
+    """Sobe o serviço e atende até ser cancelado."""
+    servico = ServicoPrice(processos, tamanho_cache, tamanho_cache_lote)
+    servidor = await asyncio.start_server(lambda l, e: _atender(servico, l, e), host, porta)
+    enderecos = ", ".join(str(s.getsockname()) for s in servidor.sockets)
+    print(f"Servindo em {enderecos}", file=sys.stderr)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servico.fechar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP para cotar parcela, taxa e valor presente (PRICE).")
+    parser.add_argument("--host", default="127.0.0.1", help="endereço (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=8000, help="porta (padrão: 8000)")
+    parser.add_argument("--processos", type=int, default=None, help="processos para lotes grandes (padrão: nº de CPUs)")
+    parser.add_argument("--cache", type=int, default=4096, help="respostas guardadas no cache (padrão: 4096)")
+    parser.add_argument("--cache-lote", type=int, default=64, help="respostas de /lote guardadas no cache (padrão: 64)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.porta, args.processos, args.cache, args.cache_lote))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import hashlib
+import io
+import os
+
+import streamlit as st
+import altair as alt
+import numpy as np
+import pandas as pd
+from financeiro import formato_moeda
+from financeiro.carteira import COLUNAS_CARTEIRA, COLUNAS_PROJECAO, blocos_csv, projetar_blocos, projetar_carteira
+from financeiro.instrumentacao import fase, instrumentado
+from financeiro.memo import CacheLRU
+from helpers import tabela_paginada
+
+# projeções recentes (a carteira de um arquivo só é recalculada se o arquivo mudar)
+_cache = CacheLRU(int(os.environ.get("PRICE_CARTEIRA_CACHE", "8")))
+
+
+def _carteira_exemplo(n, semente):
+    rng = np.random.default_rng(semente)
+    hoje = np.datetime64("today", "M")
+    inicios = hoje - rng.integers(0, 36, n).astype("timedelta64[M]")
+    return inicios, rng.uniform(1_000.0, 100_000.0, n).round(2), rng.uniform(0.005, 0.04, n), rng.integers(6, 121, n)
+
+
+def _projecao_arquivo(conteudo, sep):
+    chave = ("arquivo", hashlib.sha1(conteudo).hexdigest(), sep)
+    return _cache.obter(chave, lambda: projetar_blocos(blocos_csv(io.BytesIO(conteudo), sep=sep)))
+
+
+def _projecao_exemplo(n, semente):
+    return _cache.obter(("exemplo", n, semente), lambda: projetar_carteira(*_carteira_exemplo(n, semente)))
+
+
+@instrumentado("carteira")
+def render_carteira():
+    st.header("Projeção da Carteira")
+    st.info("Envie um CSV com as colunas inicio (AAAA-MM), valor (R$), taxa (% ao mês) e parcelas, uma linha por empréstimo. A projeção soma, mês a mês, as parcelas a receber (juros e amortização) e o saldo devedor da carteira.")
+
+    with fase("entrada"):
+        fonte = st.radio("Carteira", ["Arquivo CSV", "Carteira de exemplo"], key="cart_fonte", horizontal=True)
+        if fonte == "Arquivo CSV":
+            c1, c2 = st.columns([3, 1])
+            # file_uploader não aceita valor via session_state: key fora do prefixo "cart_"
+            arquivo = c1.file_uploader("Arquivo da carteira", type=["csv", "txt"], key="upload_carteira")
+            sep = c2.selectbox("Separador", [";", ","], key="cart_sep")
+        else:
+            c1, c2 = st.columns(2)
+            n = int(c1.number_input("Empréstimos", min_value=1, max_value=2_000_000, value=10_000, step=1_000, key="cart_n"))
+            semente = int(c2.number_input("Semente", min_value=0, value=42, step=1, key="cart_semente"))
+
+    with fase("solver"):
+        if fonte == "Arquivo CSV":
+            if arquivo is None:
+                st.caption("Exemplo de arquivo:")
+                st.code(f"{';'.join(COLUNAS_CARTEIRA)}\n2024-01;25.000,00;1,99;48\n2024-03;8.500,00;2,49;24", language="text")
+                return
+            try:
+                projecao = _projecao_arquivo(arquivo.getvalue(), sep)
+            except (ValueError, pd.errors.ParserError) as e:
+                st.error(f"Não foi possível ler a carteira: {e}")
+                return
+        else:
+            projecao = _projecao_exemplo(n, semente)
+
+    if len(projecao.meses) == 0:
+        st.warning("A carteira está vazia.")
+        return
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Total a receber", formato_moeda(float(projecao.parcelas.sum())))
+    m2.metric("Juros totais", formato_moeda(float(projecao.juros.sum())))
+    m3.metric("Saldo no pico", formato_moeda(float(projecao.saldo.max())))
+
+    df = projecao.para_pandas()
+    with fase("graficos"):
+        st.subheader("Recebimentos por mês")
+        dados = pd.DataFrame({
+            "Mês": np.concatenate([df["Mês"], df["Mês"]]),
+            "Tipo": np.repeat(np.array(["Juros", "Amortização"], dtype=object), len(df)),
+            "Valor": np.concatenate([projecao.juros, projecao.amortizacao]),
+        })
+        area = alt.Chart(dados).mark_area(opacity=0.6).encode(
+            x=alt.X("Mês:T", title="Mês"), y=alt.Y("Valor:Q", stack="zero", title="R$"),
+            color=alt.Color("Tipo:N", scale=alt.Scale(domain=["Juros", "Amortização"], range=["#d62728", "#1f77b4"])),
+        )
+        st.altair_chart(area, use_container_width=True)
+        st.subheader("Saldo devedor da carteira")
+        linha = alt.Chart(df[["Mês", "Saldo Devedor"]]).mark_line().encode(x=alt.X("Mês:T", title="Mês"), y=alt.Y("Saldo Devedor:Q", title="R$"))
+        st.altair_chart(linha, use_container_width=True)
+
+    with fase("exibicao"):
+        st.subheader("Fluxo mensal")
+        tabela_paginada(df, key="cart_tabela", colunas_moeda=COLUNAS_PROJECAO[1:])
+
+    with fase("download"):
+        st.download_button("Baixar projeção (CSV)", df.to_csv(index=False).encode("utf-8"), file_name="projecao_carteira.csv", mime="text/csv")
@@ -1,21 +1,25 @@
 import streamlit as st
 import altair as alt
 import pandas as pd
-import numpy_financial as npf
-from helpers import formato_moeda, tabela_price, money_input, percent_input
+from financeiro import formato_moeda, parcela_price
+from financeiro.instrumentacao import fase, instrumentado
+from helpers import money_input, percent_input
+from saida_price import exibir_resultado_price
 
 
+@instrumentado("parcela")
 def render_parcela():
     st.header("Calcular Parcela")
     st.info("Informe Valor total, Entrada, número de parcelas e a taxa (mensal ou anual). Retorna a parcela fixa (PRICE), juros totais e tabela de amortização.")
     # Inputs — cálculo automático (sem formulário)
-    c1, c2 = st.columns(2)
-    valor_total = money_input("Valor total (R$)", key="par_valor_total", value=3519.0, help="Preço total do bem/serviço")
-    entrada = money_input("Entrada (R$)", key="par_entrada", value=1000.0, help="Valor pago à vista")
-    c3, c4 = st.columns(2)
-    num_parcelas = int(c3.number_input("Número de parcelas", min_value=1, value=5, step=1, help="Quantidade de parcelas (máx. 360 recomendadas)"))
-    taxa_input_tipo = c4.selectbox("Taxa informada como", ["Mensal (%)", "Anual (%)"], index=0)
-    taxa_percent = percent_input("Taxa por período (%)", key="par_taxa", value=4.069200, help="Informe em % por período (ex: 2,5)")
+    with fase("entrada"):
+        c1, c2 = st.columns(2)
+        valor_total = money_input("Valor total (R$)", key="par_valor_total", value=3519.0, help="Preço total do bem/serviço")
+        entrada = money_input("Entrada (R$)", key="par_entrada", value=1000.0, help="Valor pago à vista")
+        c3, c4 = st.columns(2)
+        num_parcelas = int(c3.number_input("Número de parcelas", min_value=1, value=5, step=1, key="par_num_parcelas", help="Quantidade de parcelas (máx. 360 recomendadas)"))
+        taxa_input_tipo = c4.selectbox("Taxa informada como", ["Mensal (%)", "Anual (%)"], index=0, key="par_taxa_tipo")
+        taxa_percent = percent_input("Taxa por período (%)", key="par_taxa", value=4.069200, help="Informe em % por período (ex: 2,5)")
 
     # Validações reforçadas
     invalid = False
@@ -43,10 +47,8 @@ def render_parcela():
     if taxa_input_tipo == "Anual (%)":
         rate = rate / 12.0
 
-    if rate == 0:
-        parcela = valor_financiado / num_parcelas
-    else:
-        parcela = -npf.pmt(rate, num_parcelas, valor_financiado)
+    with fase("solver"):
+        parcela = float(parcela_price(rate, num_parcelas, valor_financiado))
 
     total_pago = parcela * num_parcelas
     juros_totais = total_pago - valor_financiado
@@ -116,26 +118,5 @@ def render_parcela():
         # st.subheader("Evolução: Taxa efetiva acumulada ao longo dos períodos")
         # st.altair_chart(line.configure_view(strokeWidth=0), use_container_width=True)
 
-    # Tabela de amortização (PRICE)
-    df = tabela_price(rate, num_parcelas, valor_financiado)
-    df_display = df.copy()
-    for c in ["Parcela", "Juros", "Amortização", "Saldo Devedor"]:
-        df_display[c] = df_display[c].apply(lambda x: f"R$ {x:,.2f}")
-    st.subheader("Tabela de Amortização (PRICE)")
-    st.table(df_display)
-
-    # Gráficos
-    st.subheader("Saldo Devedor")
-    chart_balance = alt.Chart(df).mark_line(point=True).encode(x=alt.X('Período:O'), y=alt.Y('Saldo Devedor:Q'))
-    st.altair_chart(chart_balance, use_container_width=True)
-
-    st.subheader("Composição: Juros x Amortização")
-    comp_long = df.melt(id_vars='Período', value_vars=['Juros', 'Amortização'], var_name='Tipo', value_name='Valor')
-    chart_comp = alt.Chart(comp_long).mark_area(opacity=0.6).encode(
-        x=alt.X('Período:O'), y=alt.Y('Valor:Q', stack='zero'),
-        color=alt.Color('Tipo:N', scale=alt.Scale(domain=['Juros','Amortização'], range=['#d62728','#1f77b4']))
-    )
-    st.altair_chart(chart_comp, use_container_width=True)
-
-    csv = df.to_csv(index=False).encode('utf-8')
-    st.download_button("Baixar tabela (CSV)", csv, file_name='tabela_parcela.csv', mime='text/csv')
+    # Tabela de amortização (PRICE), gráficos e CSV
+    exibir_resultado_price(rate, num_parcelas, valor_financiado, aba="parcela", nome_arquivo='tabela_parcela.csv')
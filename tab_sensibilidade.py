@@ -0,0 +1,76 @@
+import streamlit as st
+import altair as alt
+import numpy as np
+import pandas as pd
+from financeiro.instrumentacao import fase, instrumentado
+from financeiro.sensibilidade import METRICAS, grade_sensibilidade
+from helpers import money_input, percent_input
+
+# máximo de linhas/colunas desenhadas no mapa de calor (a grade completa vai para o CSV)
+MAX_CELULAS_EIXO = 60
+
+
+@instrumentado("sensibilidade")
+def render_sensibilidade():
+    st.header("Sensibilidade: Taxa x Prazo")
+    st.info("Compare ofertas de uma vez: informe o valor financiado e as faixas de taxa e prazo. O mapa mostra a métrica escolhida para cada combinação.")
+
+    with fase("entrada"):
+        c1, c2 = st.columns(2)
+        valor_financiado = money_input("Valor financiado (R$)", key="sens_pv", value=2519.0, help="Valor a ser parcelado (já sem a entrada)")
+        metrica = c2.selectbox("Métrica", list(METRICAS), format_func=METRICAS.get, key="sens_metrica")
+        c3, c4, c5 = st.columns(3)
+        with c3:
+            taxa_min = percent_input("Taxa mínima (% ao mês)", key="sens_taxa_min", value=0.5)
+        with c4:
+            taxa_max = percent_input("Taxa máxima (% ao mês)", key="sens_taxa_max", value=8.0)
+        n_taxas = int(c5.number_input("Nº de taxas", min_value=2, max_value=500, value=100, step=1, key="sens_n_taxas"))
+        c6, c7 = st.columns(2)
+        prazo_min = int(c6.number_input("Prazo mínimo", min_value=1, max_value=360, value=1, step=1, key="sens_prazo_min"))
+        prazo_max = int(c7.number_input("Prazo máximo", min_value=1, max_value=360, value=60, step=1, key="sens_prazo_max"))
+
+    invalid = False
+    if valor_financiado is None or valor_financiado <= 0:
+        invalid = True
+        c1.error("Valor financiado deve ser maior que zero e em formato válido.")
+    if taxa_min is None or taxa_max is None or taxa_min > taxa_max or taxa_min <= -100:
+        invalid = True
+        c3.error("Faixa de taxas inválida.")
+    if prazo_min > prazo_max:
+        invalid = True
+        c6.error("Prazo mínimo maior que o máximo.")
+    if invalid:
+        st.warning("Corrija os erros acima para ver o resultado.")
+        return
+
+    with fase("solver"):
+        taxas = np.linspace(taxa_min, taxa_max, n_taxas) / 100.0
+        prazos = np.arange(prazo_min, prazo_max + 1)
+        grade = grade_sensibilidade(taxas, prazos, valor_financiado)
+    valores = getattr(grade, metrica)
+    st.caption(f"{len(taxas)} taxas x {len(prazos)} prazos = {valores.size:,} cenários".replace(",", "."))
+
+    with fase("graficos"):
+        # reduzir a grade desenhada para no máximo MAX_CELULAS_EIXO em cada eixo
+        it = np.unique(np.linspace(0, len(taxas) - 1, min(len(taxas), MAX_CELULAS_EIXO)).round().astype(int))
+        ip = np.unique(np.linspace(0, len(prazos) - 1, min(len(prazos), MAX_CELULAS_EIXO)).round().astype(int))
+        sub = valores[np.ix_(it, ip)]
+        dados = pd.DataFrame({
+            "Taxa (%)": np.repeat(np.round(taxas[it] * 100.0, 4), len(ip)),
+            "Prazo": np.tile(prazos[ip], len(it)),
+            "Valor": sub.ravel(),
+        })
+        titulo = METRICAS[metrica]
+        heatmap = alt.Chart(dados).mark_rect().encode(
+            x=alt.X("Prazo:O", title="Prazo (parcelas)"),
+            y=alt.Y("Taxa (%):O", title="Taxa (% ao mês)", sort="descending"),
+            color=alt.Color("Valor:Q", title=titulo, scale=alt.Scale(scheme="viridis")),
+            tooltip=[alt.Tooltip("Taxa (%):O"), alt.Tooltip("Prazo:O"), alt.Tooltip("Valor:Q", title=titulo, format=",.2f")],
+        )
+        st.altair_chart(heatmap, use_container_width=True)
+
+    # gerar o CSV da grade inteira só quando pedido: são até 180 mil linhas
+    if st.checkbox("Preparar CSV da grade completa", key="sens_csv"):
+        with fase("download"):
+            csv = grade.para_longo().to_csv(index=False).encode("utf-8")
+            st.download_button("Baixar grade completa (CSV)", csv, file_name="sensibilidade.csv", mime="text/csv")
@@ -0,0 +1,108 @@
+import streamlit as st
+import altair as alt
+import numpy as np
+import pandas as pd
+from financeiro import memo
+from financeiro.instrumentacao import fase, instrumentado
+from financeiro.simulacao import probabilidade_mensal
+from helpers import money_input, percent_input
+
+CAMINHOS = [1_000, 5_000, 10_000, 20_000, 50_000]
+PERCENTIS = (1, 5, 25, 50, 75, 95, 99)
+
+
+def _anual(taxa_mensal):
+    return (1.0 + taxa_mensal) ** 12 - 1.0
+
+
+def _percentual(valor, casas):
+    return f"{valor * 100:.{casas}f}%".replace(".", ",")
+
+
+def _histograma(valores, titulo, cor):
+    # agrupar aqui: o navegador recebe só as barras, não um ponto por caminho
+    contagens, bordas = np.histogram(valores[np.isfinite(valores)], bins=50)
+    dados = pd.DataFrame({"inicio": bordas[:-1], "fim": bordas[1:], "Caminhos": contagens})
+    return alt.Chart(dados).mark_bar(color=cor).encode(
+        x=alt.X("inicio:Q", title=titulo), x2="fim:Q",
+        y=alt.Y("Caminhos:Q", title="Caminhos"),
+    )
+
+
+@instrumentado("simulacao")
+def render_simulacao():
+    st.header("Simulação: Pré-pagamento e Inadimplência")
+    st.info("Simula milhares de cenários em que o empréstimo pode ser quitado antes do prazo ou entrar em default. Mostra a distribuição da taxa efetivamente obtida pelo credor e da duration dos recebimentos.")
+
+    with fase("entrada"):
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            valor_financiado = money_input("Valor financiado (R$)", key="sim_pv", value=25000.0)
+        with c2:
+            taxa = percent_input("Taxa (% ao mês)", key="sim_taxa", value=1.99)
+        nper = int(c3.number_input("Parcelas", min_value=1, max_value=360, value=48, step=1, key="sim_parcelas"))
+        c4, c5, c6 = st.columns(3)
+        with c4:
+            pre_anual = percent_input("Pré-pagamento (% ao ano)", key="sim_pre", value=15.0, help="Fração dos saldos quitados antecipadamente por ano (CPR)")
+        with c5:
+            def_anual = percent_input("Inadimplência (% ao ano)", key="sim_def", value=5.0, help="Fração dos saldos que entram em default por ano (CDR)")
+        with c6:
+            recuperacao = percent_input("Recuperação (% do saldo)", key="sim_rec", value=40.0, help="Parte do saldo devedor recuperada no default")
+        c7, c8, c9 = st.columns(3)
+        emprestimos = int(c7.number_input("Empréstimos iguais", min_value=1, max_value=100, value=1, step=1, key="sim_emprestimos", help="Carteira de empréstimos iguais com eventos independentes"))
+        caminhos = c8.selectbox("Caminhos", CAMINHOS, index=2, format_func=lambda n: f"{n:,}".replace(",", "."), key="sim_caminhos")
+        semente = int(c9.number_input("Semente", min_value=0, value=0, step=1, key="sim_semente"))
+
+    invalid = False
+    if valor_financiado is None or valor_financiado <= 0:
+        invalid = True
+        c1.error("Valor financiado deve ser maior que zero e em formato válido.")
+    if taxa is None or taxa < 0:
+        invalid = True
+        c2.error("Taxa deve ser maior ou igual a zero.")
+    for coluna, valor in ((c4, pre_anual), (c5, def_anual), (c6, recuperacao)):
+        if valor is None or not 0 <= valor <= 100:
+            invalid = True
+            coluna.error("Informe um percentual entre 0 e 100.")
+    if invalid:
+        st.warning("Corrija os erros acima para ver o resultado.")
+        return
+
+    with fase("solver"):
+        resultado = memo.simulacao_price(
+            taxa / 100.0, nper, valor_financiado,
+            probabilidade_mensal(pre_anual / 100.0), probabilidade_mensal(def_anual / 100.0), recuperacao / 100.0,
+            caminhos, semente, emprestimos,
+        )
+    p = resultado.percentis(PERCENTIS)
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Taxa realizada (mediana)", f"{_percentual(p['taxa'][50], 4)} a.m.", f"{_percentual(_anual(p['taxa'][50]), 2)} a.a.", delta_color="off")
+    m2.metric("Taxa realizada (percentil 5)", f"{_percentual(p['taxa'][5], 4)} a.m.", f"{_percentual(_anual(p['taxa'][5]), 2)} a.a.", delta_color="off")
+    recebeu = np.isfinite(resultado.duracao)
+    m3.metric("Duration média", f"{resultado.duracao[recebeu].mean():.1f} meses".replace(".", ",") if recebeu.any() else "—")
+    st.caption(
+        f"Em média {_percentual(resultado.pre_pagamento.mean(), 1)} dos empréstimos quitados antecipadamente "
+        f"e {_percentual(resultado.inadimplencia.mean(), 1)} em default."
+    )
+
+    with fase("graficos"):
+        c1, c2 = st.columns(2)
+        c1.altair_chart(_histograma(_anual(resultado.taxa) * 100.0, "Taxa realizada (% a.a.)", "#1f77b4"), use_container_width=True)
+        c2.altair_chart(_histograma(resultado.duracao, "Duration (meses)", "#ff7f0e"), use_container_width=True)
+
+    with fase("exibicao"):
+        st.subheader("Percentis")
+        tabela = pd.DataFrame({
+            "Percentil": [f"P{q}" for q in PERCENTIS],
+            "Taxa (% a.m.)": [p["taxa"].get(q, np.nan) * 100.0 for q in PERCENTIS],
+            "Taxa (% a.a.)": [_anual(p["taxa"].get(q, np.nan)) * 100.0 for q in PERCENTIS],
+            "Duration (meses)": [p["duracao"].get(q, np.nan) for q in PERCENTIS],
+        })
+        st.table(tabela.style.format({"Taxa (% a.m.)": "{:.4f}", "Taxa (% a.a.)": "{:.2f}", "Duration (meses)": "{:.1f}"}, decimal=","))
+
+    # um registro por caminho: gerar o CSV só quando pedido
+    if st.checkbox("Preparar CSV dos caminhos", key="sim_csv"):
+        with fase("download"):
+            csv = resultado.para_pandas().to_csv(index=False).encode("utf-8")
+            st.download_button("Baixar caminhos (CSV)", csv, file_name="simulacao.csv", mime="text/csv")